@@ -9,8 +9,14 @@ Get-ComputerInfo | Out-File "$OutDir/computerinfo.txt"
 # 应用日志（示例路径）
 Copy-Item -Path "logs/*.log" -Destination "$OutDir/" -ErrorAction SilentlyContinue
 
+# 性能剖析报告（profiling.enabled 或 Ctrl+Alt+P 开启后生成）
+if (Test-Path "logs/profiling") {
+  New-Item -ItemType Directory -Force -Path "$OutDir/profiling" | Out-Null
+  Copy-Item -Path "logs/profiling/*" -Destination "$OutDir/profiling/" -ErrorAction SilentlyContinue
+}
+
 # 脱敏处理（简单示例：掩码 API Key）
-Get-ChildItem $OutDir -Filter *.log | ForEach-Object {
+Get-ChildItem $OutDir -Filter *.log -Recurse | ForEach-Object {
   (Get-Content $_.FullName) -replace "[A-Za-z0-9_\-]{16,}", "[REDACTED]" | Set-Content $_.FullName
 }
 
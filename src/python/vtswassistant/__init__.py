@@ -1,13 +1,20 @@
 """Core modules for the VTSW Windows assistant prototype."""
 
-from .config import AppConfig, Config, HotkeyConfig, InsertionConfig, LLMSpec, VADConfig, ASRConfig
-from .audio import AudioChunk, SpeechSegment
-from .vad import SileroVADSegmenter
+from .config import AppConfig, Config, HotkeyConfig, InsertionConfig, LexiconConfig, LLMSpec, ProfilingConfig, RecordingConfig, SchedulerConfig, VADConfig, ASRConfig
+from .audio import AudioChunk, SegmentEvent, SpeechSegment
+from .signal_stats import FrameStats, SignalStats
+from .vad import SileroVADSegmenter, VADMetrics, VADScore, score_segments
 from .asr import DoubaoASRClient, TranscriptResult
+from .lexicon import Lexicon, LexiconEntry, LexiconMatch
 from .llm import StructuredLLMFormatter, StructuredSegment, ActionItem
+from .context import ContextMetrics, LLMContextManager, PromptBuild, estimate_tokens
 from .structuring import StructuredDraftMerger
 from .template import TemplateRenderer
-from .insertion import InsertionController, InsertionStrategy
+from .insertion import InsertionController, InsertionStrategy, UndoJournal, UndoOperation
+from .profiling import PipelineProfiler, StageStats
+from .replay import RecordedSession, SessionRecorder, SessionReplayer, StageBenchmark
+from .scheduler import PriorityClassStats, PriorityScheduler
+from .hot_reload import ConfigReloader, PreparedReload, diff_config, prepare_reload
 from .pipeline import PipelineDependencies, SpeechToStructuredTextPipeline
 
 __all__ = [
@@ -16,20 +23,51 @@ __all__ = [
     "ASRConfig",
     "AudioChunk",
     "Config",
+    "ConfigReloader",
+    "ContextMetrics",
     "DoubaoASRClient",
+    "FrameStats",
     "HotkeyConfig",
     "InsertionConfig",
     "InsertionController",
     "InsertionStrategy",
+    "Lexicon",
+    "LexiconConfig",
+    "LexiconEntry",
+    "LexiconMatch",
+    "LLMContextManager",
     "LLMSpec",
     "PipelineDependencies",
+    "PipelineProfiler",
+    "PreparedReload",
+    "PriorityClassStats",
+    "PriorityScheduler",
+    "ProfilingConfig",
+    "PromptBuild",
+    "RecordedSession",
+    "RecordingConfig",
+    "SessionRecorder",
+    "SessionReplayer",
+    "SchedulerConfig",
+    "SegmentEvent",
+    "SignalStats",
     "SileroVADSegmenter",
     "SpeechSegment",
     "SpeechToStructuredTextPipeline",
+    "StageBenchmark",
+    "StageStats",
     "StructuredDraftMerger",
     "StructuredLLMFormatter",
     "StructuredSegment",
     "TemplateRenderer",
     "TranscriptResult",
+    "UndoJournal",
+    "UndoOperation",
     "VADConfig",
+    "VADMetrics",
+    "VADScore",
+    "diff_config",
+    "estimate_tokens",
+    "prepare_reload",
+    "score_segments",
 ]
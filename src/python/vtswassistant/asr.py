@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from typing import Dict
 
-from .audio import SpeechSegment
+from .audio import SegmentEvent, SpeechSegment
+from .lexicon import Lexicon
 
 
 logger = logging.getLogger(__name__)
 
+BASE_CONFIDENCE = 0.85
+# Segments at least this voiced get the full base confidence.
+FULL_CONFIDENCE_VOICED_RATIO = 0.5
+SILENCE_MEAN_AMPLITUDE = 0.2
+
 
 @dataclass(slots=True)
 class TranscriptResult:
@@ -17,15 +24,49 @@ class TranscriptResult:
 
     text: str
     is_final: bool = True
-    confidence: float = 0.85
+    confidence: float = BASE_CONFIDENCE
 
 
 class DoubaoASRClient:
     """A tiny façade that mimics the behaviour of the Doubao streaming API."""
 
-    def __init__(self, language: str = "zh-CN", enable_intermediate_results: bool = True) -> None:
+    def __init__(
+        self,
+        language: str = "zh-CN",
+        enable_intermediate_results: bool = True,
+        lexicon: Lexicon | None = None,
+    ) -> None:
         self.language = language
         self.enable_intermediate_results = enable_intermediate_results
+        self.lexicon = lexicon
+        self._open_streams: Dict[int, int] = {}
+
+    def handle_event(self, event: SegmentEvent) -> TranscriptResult | None:
+        """Consume open-segment audio from the VAD starting at speech onset.
+
+        Returns an intermediate result when ``enable_intermediate_results`` is
+        set and a hint is available; the final result still comes from
+        :meth:`transcribe_segment` once the segment closes.
+        """
+
+        if event.kind == "end":
+            frames = self._open_streams.pop(event.segment_index, 0)
+            logger.debug("Stream for segment %d closed after %d frames", event.segment_index, frames)
+            return None
+        self._open_streams[event.segment_index] = self._open_streams.get(event.segment_index, 0) + len(event.samples)
+        if not self.enable_intermediate_results or not event.transcript_hint:
+            return None
+        text = event.transcript_hint.strip()
+        if self.lexicon is not None:
+            text = self.lexicon.correct(text)
+        return TranscriptResult(text=text, is_final=False)
+
+    def streamed_frames(self, segment_index: int) -> int:
+        return self._open_streams.get(segment_index, 0)
+
+    @property
+    def open_stream_count(self) -> int:
+        return len(self._open_streams)
 
     def transcribe_segment(self, segment: SpeechSegment) -> TranscriptResult:
         """Produce a deterministic transcript for the provided speech segment."""
@@ -46,14 +87,24 @@ class DoubaoASRClient:
                 segment.end_ms,
                 len(text),
             )
-        return TranscriptResult(text=text)
+        if self.lexicon is not None:
+            text = self.lexicon.correct(text)
+        return TranscriptResult(text=text, confidence=self._confidence(segment))
+
+    def _confidence(self, segment: SpeechSegment) -> float:
+        """Scale the base confidence down for weakly voiced or silent segments."""
+
+        stats = segment.signal_stats()
+        if not stats.frame_count or stats.mean_amplitude < SILENCE_MEAN_AMPLITUDE:
+            return 0.0
+        return round(BASE_CONFIDENCE * min(1.0, stats.voiced_ratio / FULL_CONFIDENCE_VOICED_RATIO), 3)
 
     def _fallback_transcript(self, segment: SpeechSegment) -> str:
-        """Create a naive transcript from raw samples when hints are unavailable."""
+        """Create a naive transcript from the segment stats when hints are unavailable."""
 
-        if not segment.samples:
+        stats = segment.signal_stats()
+        if not stats.frame_count:
             return ""
-        mean_amplitude = sum(segment.samples) / len(segment.samples)
-        if mean_amplitude < 0.2:
+        if stats.mean_amplitude < SILENCE_MEAN_AMPLITUDE:
             return "(静音)"
-        return f"(未识别片段，平均幅度 {mean_amplitude:.2f})"
+        return f"(未识别片段，平均幅度 {stats.mean_amplitude:.2f})"
@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Iterable, List, Sequence
 
+from .signal_stats import DEFAULT_VOICED_THRESHOLD, FrameStats, SignalStats
+
 
 @dataclass(slots=True)
 class AudioChunk:
@@ -27,16 +29,52 @@ class AudioChunk:
 
 @dataclass(slots=True)
 class SpeechSegment:
-    """Represents a contiguous region of speech detected by the VAD."""
+    """Represents a contiguous region of speech detected by the VAD.
+
+    ``stats`` is filled by the VAD when it closes the segment and covers the
+    frames from the speech onset on (the pre-roll lead-in is excluded so it
+    does not dilute the silence gate); segments built elsewhere compute it
+    lazily over all samples on the first :meth:`signal_stats` call.
+    """
 
     start_ms: int
     end_ms: int
     samples: Sequence[float]
     transcript_hint: str = ""
     chunk_indices: List[int] = field(default_factory=list)
+    stats: SignalStats | None = None
 
     def duration_ms(self) -> int:
         return max(0, self.end_ms - self.start_ms)
 
+    def signal_stats(self) -> SignalStats:
+        if self.stats is None:
+            self.stats = SignalStats.compute(self.samples)
+        return self.stats
+
+    def frame_stats(self, voiced_threshold: float | None = None) -> FrameStats:
+        """Build a frame-level index over the samples (not cached; keep the result)."""
+
+        if voiced_threshold is None:
+            voiced_threshold = self.stats.voiced_threshold if self.stats else DEFAULT_VOICED_THRESHOLD
+        return FrameStats(self.samples, voiced_threshold)
+
     def iter_samples(self) -> Iterable[float]:
         yield from self.samples
+
+
+@dataclass(slots=True, frozen=True)
+class SegmentEvent:
+    """Incremental notification about an open speech segment.
+
+    ``kind`` is ``"start"`` (pre-roll plus onset frames), ``"append"`` (frames
+    added since the previous event) or ``"end"`` (carries the closed
+    :class:`SpeechSegment`).  Events for one segment share ``segment_index``.
+    """
+
+    kind: str
+    segment_index: int
+    start_ms: int
+    samples: Sequence[float] = ()
+    transcript_hint: str = ""
+    segment: SpeechSegment | None = None
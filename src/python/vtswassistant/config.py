@@ -26,6 +26,7 @@ class HotkeyConfig:
     undo_last_insert: str = "Alt+Backspace"
     switch_template: str = "Alt+T"
     pause_resume: str = "Alt+P"
+    toggle_profiling: str = "Ctrl+Alt+P"
 
 
 @dataclass(slots=True)
@@ -36,6 +37,13 @@ class VADConfig:
     max_segment_ms: int = 5000
     sample_rate: int = 16000
     frame_ms: int = 20
+    mode: str = "static"
+    min_speech_ms: int = 60
+    noise_margin: float = 0.15
+    hysteresis: float = 0.5
+    noise_adapt_ms: int = 400
+    noise_track_ms: int = 2000
+    preroll_ms: int = 200
 
 
 @dataclass(slots=True)
@@ -62,6 +70,9 @@ class LLMSpec:
     temperature: float = 0.3
     top_p: float = 0.9
     max_tokens: int = 800
+    context_tokens: int = 4096
+    context_recent_tokens: int = 1024
+    context_summary_tokens: int = 256
     stream: bool = True
     timeout_ms: int = 15000
     alt_models: Iterable[Mapping[str, str]] = field(default_factory=list)
@@ -76,6 +87,7 @@ class InsertionConfig:
     atomic_block_undo: bool = True
     newline_style: str = "list"
     max_block_chars: int = 1200
+    undo_max_chars: int = 65536
 
 
 @dataclass(slots=True)
@@ -87,6 +99,48 @@ class StructuringConfig:
     uncertain_tag: str = "（不确定）"
 
 
+@dataclass(slots=True)
+class LexiconConfig:
+    action_keywords: Iterable[str] = ("需要", "安排", "负责")
+    topic_keywords: Iterable[str] = ("主题",)
+    owners: Iterable[str] = ()
+    terms: Iterable[str] = ()
+    commands: Mapping[str, str] = field(
+        default_factory=lambda: {
+            "新段落": "new_paragraph",
+            "列要点": "list_points",
+            "改为邮件格式": "email_format",
+        }
+    )
+    hotwords: Mapping[str, str] = field(default_factory=dict)
+    files: Iterable[str] = ()
+
+
+@dataclass(slots=True)
+class SchedulerConfig:
+    enabled: bool = False
+    workers: int = 2
+    live_reserved_workers: int = 1
+
+
+@dataclass(slots=True)
+class ProfilingConfig:
+    enabled: bool = False
+    sample_interval_ms: int = 10
+    tracemalloc: bool = True
+    tracemalloc_frames: int = 1
+    snapshot_every: int = 50
+    top_n: int = 15
+    output_dir: str = "logs/profiling"
+
+
+@dataclass(slots=True)
+class RecordingConfig:
+    enabled: bool = False
+    output_dir: str = "logs/sessions"
+    compress_level: int = 6
+
+
 @dataclass(slots=True)
 class Config:
     app: AppConfig = field(default_factory=AppConfig)
@@ -96,6 +150,10 @@ class Config:
     llm: LLMSpec = field(default_factory=LLMSpec)
     structuring: StructuringConfig = field(default_factory=StructuringConfig)
     insertion: InsertionConfig = field(default_factory=InsertionConfig)
+    lexicon: LexiconConfig = field(default_factory=LexiconConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    profiling: ProfilingConfig = field(default_factory=ProfilingConfig)
+    recording: RecordingConfig = field(default_factory=RecordingConfig)
     templates: Mapping[str, str] = field(default_factory=dict)
 
     @classmethod
@@ -120,6 +178,10 @@ class Config:
             llm=load("llm", LLMSpec),
             structuring=load("structuring", StructuringConfig),
             insertion=load("insertion", InsertionConfig),
+            lexicon=load("lexicon", LexiconConfig),
+            scheduler=load("scheduler", SchedulerConfig),
+            profiling=load("profiling", ProfilingConfig),
+            recording=load("recording", RecordingConfig),
             templates=templates,
         )
 
@@ -0,0 +1,217 @@
+"""Rolling context window and token budgeting for long-session structuring."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Tuple
+
+from .config import LLMSpec
+from .llm import StructuredSegment
+
+
+logger = logging.getLogger(__name__)
+
+_CJK_PATTERN = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]")
+_SUMMARY_HEADER = "已整理摘要："
+_RECENT_HEADER = "最近内容："
+_CURRENT_HEADER = "当前片段："
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate: one token per CJK character, ~4 chars otherwise."""
+
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    other = len(text) - cjk - text.count(" ") - text.count("\n")
+    return cjk + (max(0, other) + 3) // 4
+
+
+_SECTION_OVERHEAD = estimate_tokens(_SUMMARY_HEADER + _RECENT_HEADER + _CURRENT_HEADER)
+
+
+@dataclass(slots=True)
+class PromptBuild:
+    """A prompt assembled within the configured token budget."""
+
+    text: str
+    prompt_tokens: int
+    max_tokens: int
+    recent_segments: int
+    dropped_segments: int = 0
+    truncated: bool = False
+
+
+@dataclass(slots=True)
+class ContextMetrics:
+    prompts: int = 0
+    last_prompt_tokens: int = 0
+    max_prompt_tokens: int = 0
+    total_prompt_tokens: int = 0
+    trimmed_prompts: int = 0
+    summarised_segments: int = 0
+
+    @property
+    def mean_prompt_tokens(self) -> float:
+        return self.total_prompt_tokens / self.prompts if self.prompts else 0.0
+
+
+@dataclass
+class LLMContextManager:
+    """Keeps recent segments verbatim and folds older ones into a compact summary.
+
+    ``recent_tokens`` bounds the verbatim window, ``summary_tokens`` bounds the
+    summary, and every prompt is trimmed so that prompt plus ``max_tokens``
+    completion fits in ``context_tokens``.  Token counts are cached per entry,
+    so adding a segment or building a prompt never rescans the session.
+    """
+
+    context_tokens: int = 4096
+    max_tokens: int = 800
+    recent_tokens: int = 1024
+    summary_tokens: int = 256
+    metrics: ContextMetrics = field(default_factory=ContextMetrics)
+
+    _recent: Deque[Tuple[str, StructuredSegment, int]] = field(default_factory=deque, repr=False)
+    _recent_total: int = field(default=0, repr=False)
+    _summary: Deque[List[str]] = field(default_factory=deque, repr=False)
+    _summary_sizes: Deque[int] = field(default_factory=deque, repr=False)
+    _summary_total: int = field(default=0, repr=False)
+
+    @classmethod
+    def from_spec(cls, spec: LLMSpec) -> "LLMContextManager":
+        return cls(
+            context_tokens=spec.context_tokens,
+            max_tokens=spec.max_tokens,
+            recent_tokens=spec.context_recent_tokens,
+            summary_tokens=spec.context_summary_tokens,
+        )
+
+    def reset(self) -> None:
+        self._recent.clear()
+        self._recent_total = 0
+        self._summary.clear()
+        self._summary_sizes.clear()
+        self._summary_total = 0
+
+    def observe(self, transcript: str, structured: StructuredSegment) -> None:
+        """Add a finished segment to the window, summarising whatever falls out."""
+
+        tokens = estimate_tokens(transcript)
+        self._recent.append((transcript, structured, tokens))
+        self._recent_total += tokens
+        while len(self._recent) > 1 and self._recent_total > self.recent_tokens:
+            _, evicted, evicted_tokens = self._recent.popleft()
+            self._recent_total -= evicted_tokens
+            self._fold_into_summary(evicted)
+
+    def build_prompt(self, transcript: str, system_prompt: str = "") -> PromptBuild:
+        """Assemble system prompt, summary, recent window and *transcript* within budget."""
+
+        budget = max(0, self.context_tokens - self.max_tokens - _SECTION_OVERHEAD)
+        fixed = estimate_tokens(system_prompt) + estimate_tokens(transcript)
+        truncated = False
+        if fixed > budget:
+            transcript = self._truncate_to(transcript, budget - estimate_tokens(system_prompt))
+            fixed = estimate_tokens(system_prompt) + estimate_tokens(transcript)
+            truncated = True
+
+        remaining = budget - fixed
+        summary_lines = [self._summary_line(entry) for entry in self._summary]
+        summary_sizes = list(self._summary_sizes)
+        summary_total = self._summary_total
+        recent = list(self._recent)
+        recent_total = self._recent_total
+        dropped = 0
+        while recent and summary_total + recent_total > remaining:
+            recent_total -= recent.pop(0)[2]
+            dropped += 1
+        while summary_lines and summary_total + recent_total > remaining:
+            summary_lines.pop(0)
+            summary_total -= summary_sizes.pop(0)
+
+        sections = [system_prompt] if system_prompt else []
+        if summary_lines:
+            sections.append(_SUMMARY_HEADER + "\n" + "\n".join(summary_lines))
+        if recent:
+            sections.append(_RECENT_HEADER + "\n" + "\n".join(text for text, _, _ in recent))
+        sections.append(_CURRENT_HEADER + "\n" + transcript)
+        text = "\n\n".join(sections)
+        prompt_tokens = estimate_tokens(text)
+
+        self._update_metrics(prompt_tokens, trimmed=bool(dropped) or truncated)
+        logger.debug(
+            "Built prompt with %d tokens (summary=%d, recent=%d segments, dropped=%d)",
+            prompt_tokens,
+            summary_total,
+            len(recent),
+            dropped,
+        )
+        return PromptBuild(
+            text=text,
+            prompt_tokens=prompt_tokens,
+            max_tokens=self.max_tokens,
+            recent_segments=len(recent),
+            dropped_segments=dropped,
+            truncated=truncated,
+        )
+
+    @property
+    def summary_text(self) -> str:
+        return "\n".join(self._summary_line(entry) for entry in self._summary)
+
+    @property
+    def window_tokens(self) -> int:
+        return self._recent_total + self._summary_total
+
+    # ------------------------------------------------------------------
+    def _fold_into_summary(self, structured: StructuredSegment) -> None:
+        self.metrics.summarised_segments += 1
+        facts = [action.summary() for action in structured.actions]
+        if self._summary and self._summary[-1][0] == structured.topic:
+            entry = self._summary[-1]
+            entry.extend(fact for fact in facts if fact not in entry)
+            self._summary_total -= self._summary_sizes.pop()
+        else:
+            entry = [structured.topic, *facts]
+            self._summary.append(entry)
+        size = estimate_tokens(self._summary_line(entry))
+        while size > self.summary_tokens and len(entry) > 1:
+            entry.pop(1)
+            size = estimate_tokens(self._summary_line(entry))
+        self._summary_sizes.append(size)
+        self._summary_total += size
+        while len(self._summary) > 1 and self._summary_total > self.summary_tokens:
+            self._summary.popleft()
+            self._summary_total -= self._summary_sizes.popleft()
+
+    @staticmethod
+    def _summary_line(entry: List[str]) -> str:
+        topic, *facts = entry
+        return f"- {topic}" + (f"：{'；'.join(facts)}" if facts else "")
+
+    @staticmethod
+    def _truncate_to(text: str, tokens: int) -> str:
+        # Keep the tail: the newest words matter most for the current segment.
+        if tokens <= 0:
+            return ""
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high) // 2
+            if estimate_tokens(text[middle:]) <= tokens:
+                high = middle
+            else:
+                low = middle + 1
+        return text[low:]
+
+    def _update_metrics(self, prompt_tokens: int, trimmed: bool) -> None:
+        metrics = self.metrics
+        metrics.prompts += 1
+        metrics.last_prompt_tokens = prompt_tokens
+        metrics.max_prompt_tokens = max(metrics.max_prompt_tokens, prompt_tokens)
+        metrics.total_prompt_tokens += prompt_tokens
+        if trimmed:
+            metrics.trimmed_prompts += 1
@@ -0,0 +1,245 @@
+"""Config hot-reload: parse and rebuild off the hot path, swap between segments."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, FrozenSet, Mapping, Set, Tuple
+
+from .asr import DoubaoASRClient
+from .config import Config, load_config
+from .lexicon import Lexicon
+from .llm import StructuredLLMFormatter
+from .template import TemplateRenderer
+from .vad import SileroVADSegmenter
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .pipeline import SpeechToStructuredTextPipeline
+
+
+logger = logging.getLogger(__name__)
+
+# Components rebuilt (or retuned in place) when a config section changes.
+# Sections missing here (app, hotkeys, profiling, ...) only swap the Config.
+SECTION_COMPONENTS: Mapping[str, Tuple[str, ...]] = {
+    "vad": ("vad",),
+    "asr": ("asr",),
+    "llm": ("llm",),
+    "lexicon": ("lexicon",),
+    "structuring": ("llm", "renderer", "merger"),
+    "templates": ("renderer",),
+    "insertion": ("insertion",),
+}
+
+
+# Fields that size the VAD buffers; only these force a new segmenter.  The
+# rest are retuned in place so the noise floor and pre-roll ring stay warm.
+VAD_GEOMETRY: Tuple[str, ...] = ("frame_ms", "preroll_ms")
+VAD_TUNABLES: Tuple[str, ...] = (
+    "threshold",
+    "min_silence_ms",
+    "max_segment_ms",
+    "mode",
+    "min_speech_ms",
+    "noise_margin",
+    "hysteresis",
+    "noise_adapt_ms",
+    "noise_track_ms",
+)
+
+
+def diff_config(old: Config, new: Config) -> FrozenSet[str]:
+    """Return the names of top-level sections that differ between two configs."""
+
+    return frozenset(item.name for item in fields(Config) if getattr(old, item.name) != getattr(new, item.name))
+
+
+@dataclass(slots=True)
+class PreparedReload:
+    """A parsed config plus the components prebuilt for it, ready to swap in."""
+
+    config: Config
+    sections: FrozenSet[str]
+    components: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def affected(self) -> Set[str]:
+        affected: Set[str] = set()
+        for section in self.sections:
+            affected.update(SECTION_COMPONENTS.get(section, ()))
+        return affected
+
+
+def prepare_reload(pipeline: "SpeechToStructuredTextPipeline", config: Config) -> PreparedReload | None:
+    """Diff *config* against the running one and prebuild only what changed."""
+
+    sections = diff_config(pipeline.config, config)
+    if not sections:
+        return None
+    prepared = PreparedReload(config=config, sections=sections)
+    affected = prepared.affected
+    deps = pipeline.deps
+    if "vad" in affected and any(getattr(config.vad, name) != getattr(deps.vad, name) for name in VAD_GEOMETRY):
+        vad = config.vad
+        prepared.components["vad"] = SileroVADSegmenter(
+            threshold=vad.threshold,
+            min_silence_ms=vad.min_silence_ms,
+            max_segment_ms=vad.max_segment_ms,
+            frame_ms=vad.frame_ms,
+            mode=vad.mode,
+            min_speech_ms=vad.min_speech_ms,
+            noise_margin=vad.noise_margin,
+            hysteresis=vad.hysteresis,
+            noise_adapt_ms=vad.noise_adapt_ms,
+            noise_track_ms=vad.noise_track_ms,
+            preroll_ms=vad.preroll_ms,
+            metrics=deps.vad.metrics,
+        )
+    if "asr" in affected:
+        prepared.components["asr"] = DoubaoASRClient(
+            language=config.asr.language,
+            enable_intermediate_results=config.asr.enable_intermediate_results,
+            lexicon=deps.asr.lexicon,
+        )
+    if "llm" in affected:
+        prepared.components["llm"] = StructuredLLMFormatter(
+            config.structuring.uncertain_tag,
+            context=deps.llm.context,
+            system_prompt=config.llm.prompt if deps.llm.system_prompt else "",
+            lexicon=deps.llm.lexicon,
+        )
+    if "renderer" in affected:
+        prepared.components["renderer"] = TemplateRenderer(
+            config.templates, uncertain_tag=config.structuring.uncertain_tag
+        )
+    if "lexicon" in affected:
+        prepared.components["lexicon"] = Lexicon.from_config(config.lexicon)
+    logger.info("Prepared config reload for sections %s (components=%s)", sorted(sections), sorted(affected))
+    return prepared
+
+
+def apply_stream(pipeline: "SpeechToStructuredTextPipeline", prepared: PreparedReload) -> None:
+    """Apply the audio-side half of a reload: the VAD and the streaming ASR.
+
+    Both are driven by the thread feeding audio, so they switch together at
+    one segment boundary; call only while the VAD is idle.  The VAD is retuned
+    in place, or the rebuilt one is swapped in.
+    """
+
+    if "asr" in prepared.components:
+        pipeline.deps.asr = prepared.components["asr"]  # type: ignore[assignment]
+    if "vad" not in prepared.affected:
+        return
+    vad = pipeline.deps.vad
+    rebuilt = prepared.components.get("vad")
+    if isinstance(rebuilt, SileroVADSegmenter):
+        rebuilt.adopt_state(vad)
+        for listener in vad.listeners:
+            rebuilt.add_listener(listener)
+        pipeline.deps.vad = rebuilt
+        return
+    for name in VAD_TUNABLES:
+        setattr(vad, name, getattr(prepared.config.vad, name))
+
+
+def apply_components(pipeline: "SpeechToStructuredTextPipeline", prepared: PreparedReload) -> None:
+    """Swap prebuilt components (except VAD and ASR, see :func:`apply_stream`) into *pipeline*.
+
+    Stateful components (merger, insertion, context window) are retuned in
+    place so undo history and warm state survive the reload.
+    """
+
+    deps = pipeline.deps
+    config = prepared.config
+    affected = prepared.affected
+    if "llm" in prepared.components:
+        deps.llm = prepared.components["llm"]  # type: ignore[assignment]
+    if deps.llm.context is not None and "llm" in prepared.sections:
+        context = deps.llm.context
+        context.context_tokens = config.llm.context_tokens
+        context.max_tokens = config.llm.max_tokens
+        context.recent_tokens = config.llm.context_recent_tokens
+        context.summary_tokens = config.llm.context_summary_tokens
+    if "renderer" in prepared.components:
+        deps.renderer = prepared.components["renderer"]  # type: ignore[assignment]
+    if "lexicon" in prepared.components:
+        compiled: Lexicon = prepared.components["lexicon"]  # type: ignore[assignment]
+        shared = {id(lexicon): lexicon for lexicon in (deps.lexicon, deps.asr.lexicon, deps.llm.lexicon) if lexicon}
+        for lexicon in shared.values():
+            lexicon.adopt(compiled)
+    if "merger" in affected:
+        deps.merger.merge_policy = config.structuring.merge_policy
+    if "structuring" in prepared.sections:
+        deps.insertion.realtime_write = config.structuring.realtime_write
+    if "insertion" in affected:
+        if tuple(config.insertion.strategy_order) != tuple(pipeline.config.insertion.strategy_order):
+            deps.insertion.set_strategy_order(config.insertion.strategy_order)
+        deps.insertion.atomic_block_undo = config.insertion.atomic_block_undo
+        deps.insertion.set_undo_max_chars(config.insertion.undo_max_chars)
+    pipeline.config = config
+    logger.info("Applied config reload for sections %s", sorted(prepared.sections))
+
+
+class ConfigReloader:
+    """Watches a config file and stages reloads on a pipeline.
+
+    Parsing, diffing and component construction run on the watcher thread (or
+    the caller of :meth:`check`); the pipeline applies the staged result at the
+    next segment boundary.  Invalid files are logged and ignored.
+    """
+
+    def __init__(
+        self, path: Path, pipeline: "SpeechToStructuredTextPipeline", interval_s: float = 1.0
+    ) -> None:
+        self.path = path
+        self.pipeline = pipeline
+        self.interval_s = interval_s
+        self._signature = self._stat()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name="vtsw-config-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """Reload if the file changed since the last check; return ``True`` if staged."""
+
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            config = load_config(self.path)
+        except Exception:  # noqa: BLE001 - keep the running config on bad edits
+            logger.exception("Ignoring invalid configuration change in %s", self.path)
+            return False
+        prepared = prepare_reload(self.pipeline, config)
+        if prepared is None:
+            logger.debug("Config file changed but no section differs")
+            return False
+        self.pipeline.stage_reload(prepared)
+        return True
+
+    # ------------------------------------------------------------------
+    def _stat(self) -> Tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.interval_s):
+            self.check()
@@ -3,12 +3,193 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Sequence
+from typing import Deque, Iterable, Iterator, List, Sequence, overload
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_UNDO_MAX_CHARS = 65536
+
+
+@dataclass(slots=True, frozen=True)
+class UndoOperation:
+    """A single compact edit recorded by :class:`UndoJournal`.
+
+    Only the changed span is stored: replacing ``removed`` at ``offset`` with
+    ``inserted`` turns the previous document into the committed one.
+    """
+
+    offset: int
+    removed: str
+    inserted: str
+    strategy: str = ""
+
+    @property
+    def removed_length(self) -> int:
+        return len(self.removed)
+
+    @property
+    def size_chars(self) -> int:
+        return len(self.removed) + len(self.inserted)
+
+    def apply(self, document: str) -> str:
+        return document[: self.offset] + self.inserted + document[self.offset + len(self.removed) :]
+
+    def revert(self, document: str) -> str:
+        return document[: self.offset] + self.removed + document[self.offset + len(self.inserted) :]
+
+
+def _common_prefix_length(old: str, new: str) -> int:
+    limit = min(len(old), len(new))
+    if new.startswith(old[:limit]):
+        return limit
+    # Binary search on slice equality keeps the comparison in C.
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(old: str, new: str, limit: int) -> int:
+    if limit <= 0:
+        return 0
+    if new.endswith(old[len(old) - limit :]):
+        return limit
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle :] == new[len(new) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+@dataclass
+class UndoJournal:
+    """Keeps the current document plus a memory-capped stack of compact edits.
+
+    The merger hands over the whole accumulated document on every commit, so
+    storing each committed text would keep O(n²) characters alive.  The journal
+    stores only the diff of each commit against the previous document and drops
+    the oldest operations once their combined size exceeds ``max_chars``.  The
+    most recent operation is always retained so atomic undo keeps working.
+    """
+
+    max_chars: int = DEFAULT_UNDO_MAX_CHARS
+    document: str = ""
+    _ops: Deque[UndoOperation] = field(default_factory=deque, repr=False)
+    _chars: int = field(default=0, repr=False)
+
+    def record(self, text: str, strategy: str = "") -> UndoOperation:
+        """Record *text* as the new document and return the compact operation."""
+
+        old = self.document
+        prefix = _common_prefix_length(old, text)
+        suffix = _common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+        operation = UndoOperation(
+            offset=prefix,
+            removed=old[prefix : len(old) - suffix],
+            inserted=text[prefix : len(text) - suffix],
+            strategy=strategy,
+        )
+        self.document = text
+        self._ops.append(operation)
+        self._chars += operation.size_chars
+        self._trim()
+        logger.debug(
+            "Journal recorded op at offset %d (-%d/+%d chars, strategy='%s'); depth=%d",
+            operation.offset,
+            operation.removed_length,
+            len(operation.inserted),
+            strategy,
+            len(self._ops),
+        )
+        return operation
+
+    def undo(self) -> UndoOperation | None:
+        """Revert the most recent operation, returning it (or ``None`` if empty)."""
+
+        if not self._ops:
+            return None
+        operation = self._ops.pop()
+        self._chars -= operation.size_chars
+        self.document = operation.revert(self.document)
+        return operation
+
+    def peek(self) -> UndoOperation | None:
+        return self._ops[-1] if self._ops else None
+
+    def clear(self) -> None:
+        self._ops.clear()
+        self._chars = 0
+        self.document = ""
+
+    def snapshot(self, index: int) -> str:
+        """Rebuild the document as it was right after the retained op at *index*."""
+
+        depth = len(self._ops)
+        if index < 0:
+            index += depth
+        if not 0 <= index < depth:
+            raise IndexError("journal index out of range")
+        document = self.document
+        for position in range(depth - 1, index, -1):
+            document = self._ops[position].revert(document)
+        return document
+
+    @property
+    def memory_chars(self) -> int:
+        """Characters held by retained operations (excluding the live document)."""
+
+        return self._chars
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def __iter__(self) -> Iterator[UndoOperation]:
+        return iter(self._ops)
+
+    def _trim(self) -> None:
+        while len(self._ops) > 1 and self._chars > self.max_chars:
+            dropped = self._ops.popleft()
+            self._chars -= dropped.size_chars
+            logger.debug("Journal dropped oldest op (%d chars) to stay under cap", dropped.size_chars)
+
+
+class JournalView(Sequence[str]):
+    """Read-only sequence of committed texts reconstructed from a journal."""
+
+    __slots__ = ("_journal",)
+
+    def __init__(self, journal: UndoJournal) -> None:
+        self._journal = journal
+
+    def __len__(self) -> int:
+        return len(self._journal)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | List[str]:
+        if isinstance(index, slice):
+            return [self._journal.snapshot(i) for i in range(*index.indices(len(self)))]
+        if index in (-1, len(self) - 1) and len(self):
+            return self._journal.document
+        return self._journal.snapshot(index)
+
+    def __repr__(self) -> str:
+        return f"JournalView(depth={len(self)}, chars={self._journal.memory_chars})"
+
 
 @dataclass
 class InsertionStrategy:
@@ -17,19 +198,22 @@ class InsertionStrategy:
     name: str
     max_length: int | None = None
     fail: bool = False
-    inserted: List[str] = field(default_factory=list)
+    journal: UndoJournal = field(default_factory=UndoJournal)
 
     def insert(self, text: str) -> bool:
         if self.fail:
             return False
         if self.max_length is not None and len(text) > self.max_length:
             return False
-        self.inserted.append(text)
+        self.journal.record(text, strategy=self.name)
         return True
 
     def undo(self) -> None:
-        if self.inserted:
-            self.inserted.pop()
+        self.journal.undo()
+
+    @property
+    def inserted(self) -> JournalView:
+        return JournalView(self.journal)
 
 
 @dataclass
@@ -37,11 +221,36 @@ class InsertionController:
     strategies: Sequence[InsertionStrategy]
     realtime_write: bool = False
     atomic_block_undo: bool = True
+    undo_max_chars: int = DEFAULT_UNDO_MAX_CHARS
 
-    committed_blocks: List[str] = field(default_factory=list)
-    _last_strategy: InsertionStrategy | None = None
+    journal: UndoJournal = field(default_factory=UndoJournal)
     _staged_text: str = ""
 
+    def __post_init__(self) -> None:
+        self.set_undo_max_chars(self.undo_max_chars)
+
+    def set_undo_max_chars(self, max_chars: int) -> None:
+        """Apply one undo cap to the controller and every strategy journal."""
+
+        self.undo_max_chars = max_chars
+        for journal in (self.journal, *(strategy.journal for strategy in self.strategies)):
+            journal.max_chars = max_chars
+
+    def set_strategy_order(self, names: Iterable[str]) -> None:
+        """Reorder the strategies by *names*, keeping existing ones (and their journals).
+
+        Strategies not yet present are created with defaults; ones no longer
+        listed are dropped.
+        """
+
+        existing = {strategy.name: strategy for strategy in self.strategies}
+        self.strategies = [existing.get(name) or InsertionStrategy(name=name) for name in names]
+        self.set_undo_max_chars(self.undo_max_chars)
+
+    @property
+    def committed_blocks(self) -> JournalView:
+        return JournalView(self.journal)
+
     def stage(self, text: str, final: bool = False) -> None:
         logger.debug(
             "Staging text (len=%d, final=%s, realtime=%s)",
@@ -58,20 +267,26 @@ class InsertionController:
         for strategy in self.strategies:
             logger.debug("Trying strategy '%s'", strategy.name)
             if strategy.insert(self._staged_text):
-                self._last_strategy = strategy
-                self.committed_blocks.append(self._staged_text)
+                self.journal.record(self._staged_text, strategy=strategy.name)
                 logger.debug("Strategy '%s' committed text", strategy.name)
                 return
         raise RuntimeError("All insertion strategies failed.")
 
     def undo_last(self) -> None:
-        if not self.committed_blocks:
+        operation = self.journal.undo()
+        if operation is None:
             logger.debug("Undo requested with no committed blocks")
             return
-        if self.atomic_block_undo and self._last_strategy is not None:
-            logger.debug("Undoing last commit via strategy '%s'", self._last_strategy.name)
-            self._last_strategy.undo()
-        self.committed_blocks.pop()
+        if self.atomic_block_undo:
+            strategy = self._strategy_named(operation.strategy)
+            if strategy is not None:
+                logger.debug("Undoing last commit via strategy '%s'", strategy.name)
+                strategy.undo()
         self._staged_text = ""
-        self._last_strategy = None
-        logger.debug("Undo complete; %d blocks remain", len(self.committed_blocks))
+        logger.debug("Undo complete; %d blocks remain", len(self.journal))
+
+    def _strategy_named(self, name: str) -> InsertionStrategy | None:
+        for strategy in self.strategies:
+            if strategy.name == name:
+                return strategy
+        return None
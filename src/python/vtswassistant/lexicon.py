@@ -0,0 +1,214 @@
+"""Aho-Corasick lexicon for keywords, owner names, hotwords and voice commands."""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Sequence, Tuple
+
+from .config import LexiconConfig
+
+
+logger = logging.getLogger(__name__)
+
+ACTION = "action"
+TOPIC = "topic"
+OWNER = "owner"
+COMMAND = "command"
+HOTWORD = "hotword"
+TERM = "term"
+
+
+@dataclass(slots=True, frozen=True)
+class LexiconEntry:
+    term: str
+    kind: str
+    value: str = ""
+
+
+@dataclass(slots=True, frozen=True)
+class LexiconMatch:
+    start: int
+    end: int
+    entry: LexiconEntry
+
+    @property
+    def term(self) -> str:
+        return self.entry.term
+
+    @property
+    def kind(self) -> str:
+        return self.entry.kind
+
+    @property
+    def value(self) -> str:
+        return self.entry.value or self.entry.term
+
+
+class _Automaton:
+    """Immutable compiled automaton; replaced wholesale on reload."""
+
+    __slots__ = ("entries", "goto", "fail", "out")
+
+    def __init__(self, entries: Sequence[LexiconEntry]) -> None:
+        self.entries = tuple(entries)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for index, entry in enumerate(self.entries):
+            state = 0
+            for char in entry.term:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    out.append([])
+                state = following
+            out[state].append(index)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[following] = goto[fallback].get(char, 0)
+                out[following].extend(out[fail[following]])
+
+        self.goto = goto
+        self.fail = fail
+        self.out: List[Tuple[int, ...]] = [tuple(indices) for indices in out]
+
+    def scan(self, text: str) -> List[LexiconMatch]:
+        goto, fail, out, entries = self.goto, self.fail, self.out, self.entries
+        matches: List[LexiconMatch] = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                end = position + 1
+                for index in out[state]:
+                    entry = entries[index]
+                    matches.append(LexiconMatch(end - len(entry.term), end, entry))
+        return matches
+
+
+class Lexicon:
+    """Matches every configured term in one linear pass over the text.
+
+    The compiled automaton is immutable; :meth:`reload` builds a new one only
+    when the entry set changed and swaps it in with a single assignment, so
+    readers on other threads never observe a half-built automaton.
+    """
+
+    def __init__(self, entries: Iterable[LexiconEntry] = ()) -> None:
+        self._automaton = _Automaton(self._dedupe(entries))
+
+    @classmethod
+    def from_config(cls, config: LexiconConfig) -> "Lexicon":
+        return cls(cls.entries_from_config(config))
+
+    @staticmethod
+    def entries_from_config(config: LexiconConfig) -> List[LexiconEntry]:
+        entries = [LexiconEntry(term, ACTION) for term in config.action_keywords]
+        entries += [LexiconEntry(term, TOPIC) for term in config.topic_keywords]
+        entries += [LexiconEntry(term, OWNER) for term in config.owners]
+        entries += [LexiconEntry(term, TERM) for term in config.terms]
+        entries += [LexiconEntry(phrase, COMMAND, command) for phrase, command in config.commands.items()]
+        entries += [LexiconEntry(variant, HOTWORD, canonical) for variant, canonical in config.hotwords.items()]
+        for path in config.files:
+            entries += _load_dictionary(Path(path))
+        return entries
+
+    @property
+    def entries(self) -> Tuple[LexiconEntry, ...]:
+        return self._automaton.entries
+
+    def __len__(self) -> int:
+        return len(self._automaton.entries)
+
+    def reload(self, config: LexiconConfig) -> bool:
+        """Recompile from *config* if its entries differ; return ``True`` if swapped."""
+
+        entries = self._dedupe(self.entries_from_config(config))
+        if entries == list(self._automaton.entries):
+            logger.debug("Lexicon reload skipped; %d entries unchanged", len(entries))
+            return False
+        self._automaton = _Automaton(entries)
+        logger.info("Lexicon reloaded with %d entries", len(entries))
+        return True
+
+    def adopt(self, other: "Lexicon") -> None:
+        """Take over *other*'s compiled automaton (compiled elsewhere, swapped here)."""
+
+        self._automaton = other._automaton
+
+    def add(self, entries: Iterable[LexiconEntry]) -> None:
+        self._automaton = _Automaton(self._dedupe([*self._automaton.entries, *entries]))
+
+    def find_all(self, text: str, kinds: Collection[str] | None = None) -> List[LexiconMatch]:
+        """Return every (possibly overlapping) match ordered by end position."""
+
+        matches = self._automaton.scan(text)
+        if kinds is None:
+            return matches
+        return [match for match in matches if match.kind in kinds]
+
+    def longest_matches(self, text: str, kinds: Collection[str] | None = None) -> List[LexiconMatch]:
+        """Return leftmost-longest, non-overlapping matches."""
+
+        ordered = sorted(self.find_all(text, kinds), key=lambda match: (match.start, -match.end))
+        selected: List[LexiconMatch] = []
+        cursor = 0
+        for match in ordered:
+            if match.start >= cursor:
+                selected.append(match)
+                cursor = match.end
+        return selected
+
+    def correct(self, text: str) -> str:
+        """Replace hotword variants with their canonical spelling."""
+
+        replacements = self.longest_matches(text, (HOTWORD,))
+        if not replacements:
+            return text
+        parts: List[str] = []
+        cursor = 0
+        for match in replacements:
+            parts.append(text[cursor : match.start])
+            parts.append(match.value)
+            cursor = match.end
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+    def commands(self, text: str) -> List[LexiconMatch]:
+        return self.longest_matches(text, (COMMAND,))
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _dedupe(entries: Iterable[LexiconEntry]) -> List[LexiconEntry]:
+        return [entry for entry in dict.fromkeys(entries) if entry.term]
+
+
+def _load_dictionary(path: Path) -> List[LexiconEntry]:
+    """Read a ``kind<TAB>term[<TAB>value]`` user dictionary; ``#`` starts a comment."""
+
+    entries: List[LexiconEntry] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) < 2:
+                raise ValueError(f"{path}:{line_number}: expected 'kind<TAB>term[<TAB>value]'.")
+            entries.append(LexiconEntry(fields[1].strip(), fields[0].strip(), fields[2].strip() if len(fields) > 2 else ""))
+    logger.debug("Loaded %d lexicon entries from %s", len(entries), path)
+    return entries
@@ -5,11 +5,32 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import TYPE_CHECKING, Iterable, List, Sequence
+
+from .config import LexiconConfig
+from .lexicon import ACTION, OWNER, TOPIC, Lexicon, LexiconMatch
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .context import LLMContextManager, PromptBuild
 
 
 logger = logging.getLogger(__name__)
 
+_OWNER_BEFORE = re.compile(r"[\w\u4e00-\u9fa5]{1,8}$")
+_OWNER_AFTER = re.compile(r"([\w\u4e00-\u9fa5]{1,8}?)(?=并|和|且|及|，|,|。|\s|$)")
+
+
+def _gap(owner: LexiconMatch, keyword: LexiconMatch) -> int:
+    """Characters between *owner* and *keyword*; 0 or 1 counts as adjacent, negative overlaps."""
+
+    return max(keyword.start - owner.end, owner.start - keyword.end)
+
+
+def _nearest_owner(owners: Sequence[LexiconMatch], keywords: Sequence[LexiconMatch]) -> LexiconMatch:
+    # "王强说李雷负责…": the name next to the action keyword owns it, not the
+    # first name in the sentence; ties keep sentence order.
+    return min(owners, key=lambda owner: min(abs(_gap(owner, keyword)) for keyword in keywords))
+
 
 @dataclass(slots=True)
 class ActionItem:
@@ -34,20 +55,35 @@ class StructuredSegment:
 class StructuredLLMFormatter:
     """A lightweight deterministic formatter used for unit tests."""
 
-    def __init__(self, uncertain_tag: str = "（不确定）") -> None:
+    def __init__(
+        self,
+        uncertain_tag: str = "（不确定）",
+        context: "LLMContextManager | None" = None,
+        system_prompt: str = "",
+        lexicon: Lexicon | None = None,
+    ) -> None:
         self.uncertain_tag = uncertain_tag
+        self.lexicon = lexicon or Lexicon.from_config(LexiconConfig())
+        self.context = context
+        self.system_prompt = system_prompt
+        self.last_prompt: "PromptBuild | None" = None
 
     def structure(self, transcript: str) -> StructuredSegment:
         cleaned = self._normalise_text(transcript)
         logger.debug("Structuring transcript (len=%d)", len(cleaned))
+        if self.context is not None:
+            # The request a remote model would receive; the rule-based path only
+            # records it so prompt-size metrics match production.
+            self.last_prompt = self.context.build_prompt(cleaned, self.system_prompt)
         sentences = [s for s in self._split_sentences(cleaned) if s]
         if not sentences:
             logger.debug("Transcript empty after normalisation; returning uncertain segment")
             return StructuredSegment(topic=self.uncertain_tag, points=(), actions=())
 
-        topic = self._extract_topic(sentences)
+        matches = [self.lexicon.find_all(sentence) for sentence in sentences]
+        topic = self._extract_topic(sentences, matches)
         points = self._extract_points(sentences, topic)
-        actions = self._extract_actions(sentences)
+        actions = self._extract_actions(sentences, matches)
         logger.debug(
             "Structured result topic='%s' with %d points and %d actions",
             topic,
@@ -58,7 +94,10 @@ class StructuredLLMFormatter:
         if not points:
             points = (cleaned or self.uncertain_tag,)
 
-        return StructuredSegment(topic=topic, points=points, actions=actions)
+        structured = StructuredSegment(topic=topic, points=points, actions=actions)
+        if self.context is not None:
+            self.context.observe(cleaned, structured)
+        return structured
 
     # ------------------------------------------------------------------
     def _normalise_text(self, transcript: str) -> str:
@@ -73,10 +112,10 @@ class StructuredLLMFormatter:
             if trimmed:
                 yield trimmed
 
-    def _extract_topic(self, sentences: Sequence[str]) -> str:
+    def _extract_topic(self, sentences: Sequence[str], matches: Sequence[List[LexiconMatch]]) -> str:
         logger.debug("Extracting topic from %d sentences", len(sentences))
-        for sentence in sentences:
-            if "主题" in sentence:
+        for sentence, found in zip(sentences, matches):
+            if any(match.kind == TOPIC for match in found):
                 return sentence
         return sentences[0][:20]
 
@@ -89,33 +128,55 @@ class StructuredLLMFormatter:
             points.append(sentence)
         return points
 
-    def _extract_actions(self, sentences: Sequence[str]) -> Sequence[ActionItem]:
+    def _extract_actions(
+        self, sentences: Sequence[str], matches: Sequence[List[LexiconMatch]]
+    ) -> Sequence[ActionItem]:
         actions: List[ActionItem] = []
         logger.debug("Extracting action items")
-        for sentence in sentences:
-            if "需要" in sentence or "安排" in sentence or "负责" in sentence:
-                owner, description = self._split_owner_and_desc(sentence)
+        for sentence, found in zip(sentences, matches):
+            keywords = [match for match in found if match.kind == ACTION]
+            if keywords:
+                owners = [match for match in found if match.kind == OWNER]
+                if owners:
+                    owner, description = self._owner_from_lexicon(sentence, _nearest_owner(owners, keywords), keywords)
+                else:
+                    owner, description = self._split_owner_and_desc(sentence, keywords)
                 actions.append(ActionItem(owner=owner, description=description, due=self._detect_due(sentence)))
         return actions
 
-    def _split_owner_and_desc(self, sentence: str) -> tuple[str, str]:
-        match = re.search(r"([\w\u4e00-\u9fa5]{1,8})(?=负责|需要|安排)", sentence)
-        if match:
-            owner = match.group(1)
-            remainder = sentence[match.end():].lstrip("：:，, ")
-            description = remainder or sentence
+    def _owner_from_lexicon(
+        self, sentence: str, owner: LexiconMatch, keywords: Sequence[LexiconMatch]
+    ) -> tuple[str, str]:
+        # A known name is authoritative; the description follows whichever of
+        # the name or the action keyword next to it comes last.
+        cut = owner.end
+        for keyword in keywords:
+            if 0 <= _gap(owner, keyword) <= 1:
+                cut = max(cut, keyword.end)
+        description = sentence[cut:].lstrip("：:，, ") or sentence
+        logger.debug("Lexicon owner='%s' description='%s'", owner.term, description)
+        return owner.term, description
+
+    def _split_owner_and_desc(self, sentence: str, keywords: Sequence[LexiconMatch]) -> tuple[str, str]:
+        # Owner is the name right before an action keyword ("王强负责…"), or
+        # failing that the short name right after one ("安排李雷并…").
+        ordered = sorted(keywords, key=lambda match: match.start)
+        owner = None
+        for keyword in ordered:
+            before = _OWNER_BEFORE.search(sentence, 0, keyword.start)
+            if before:
+                owner, description = before.group(0), sentence[keyword.start :]
+                break
+        else:
+            for keyword in ordered:
+                after = _OWNER_AFTER.match(sentence, keyword.end)
+                if after:
+                    owner, description = after.group(1), sentence[after.end() :]
+                    break
+        if owner is None:
+            owner, description = self.uncertain_tag, sentence
         else:
-            after = re.search(
-                r"(?:负责|需要|安排)([\w\u4e00-\u9fa5]{1,8}?)(?=并|和|且|及|，|,|。|\s|$)",
-                sentence,
-            )
-            if after:
-                owner = after.group(1)
-                remainder = sentence[after.end():].lstrip("：:，, ")
-                description = remainder or sentence
-            else:
-                owner = self.uncertain_tag
-                description = sentence
+            description = description.lstrip("：:，, ") or sentence
         logger.debug("Parsed action owner='%s' description='%s'", owner, description)
         return owner, description
 
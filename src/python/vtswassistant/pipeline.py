@@ -4,13 +4,20 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Sequence
 
-from .audio import AudioChunk, SpeechSegment
-from .asr import DoubaoASRClient
+from .audio import AudioChunk, SegmentEvent, SpeechSegment
+from .asr import DoubaoASRClient, TranscriptResult
 from .config import Config
-from .insertion import InsertionController
+from .context import LLMContextManager
+from .insertion import InsertionController, InsertionStrategy
+from .hot_reload import PreparedReload, apply_components, apply_stream
+from .lexicon import Lexicon, LexiconMatch
 from .llm import StructuredLLMFormatter
+from .profiling import PipelineProfiler
+from .replay import SessionRecorder
+from .scheduler import PriorityScheduler
 from .structuring import StructuredDraftMerger
 from .template import TemplateRenderer
 from .vad import SileroVADSegmenter
@@ -26,6 +33,52 @@ class PipelineDependencies:
     merger: StructuredDraftMerger
     renderer: TemplateRenderer
     insertion: InsertionController
+    profiler: PipelineProfiler | None = None
+    recorder: SessionRecorder | None = None
+    lexicon: Lexicon | None = None
+    scheduler: PriorityScheduler | None = None
+
+    @classmethod
+    def from_config(cls, config: Config) -> "PipelineDependencies":
+        """Build the default component set described by *config*."""
+
+        vad = config.vad
+        lexicon = Lexicon.from_config(config.lexicon)
+        return cls(
+            vad=SileroVADSegmenter(
+                threshold=vad.threshold,
+                min_silence_ms=vad.min_silence_ms,
+                max_segment_ms=vad.max_segment_ms,
+                frame_ms=vad.frame_ms,
+                mode=vad.mode,
+                min_speech_ms=vad.min_speech_ms,
+                noise_margin=vad.noise_margin,
+                hysteresis=vad.hysteresis,
+                noise_adapt_ms=vad.noise_adapt_ms,
+                noise_track_ms=vad.noise_track_ms,
+                preroll_ms=vad.preroll_ms,
+            ),
+            asr=DoubaoASRClient(
+                language=config.asr.language,
+                enable_intermediate_results=config.asr.enable_intermediate_results,
+                lexicon=lexicon,
+            ),
+            llm=StructuredLLMFormatter(
+                config.structuring.uncertain_tag,
+                context=LLMContextManager.from_spec(config.llm),
+                system_prompt=config.llm.prompt,
+                lexicon=lexicon,
+            ),
+            merger=StructuredDraftMerger(config.structuring.merge_policy),
+            renderer=TemplateRenderer(config.templates, uncertain_tag=config.structuring.uncertain_tag),
+            insertion=InsertionController(
+                strategies=[InsertionStrategy(name=name) for name in config.insertion.strategy_order],
+                realtime_write=config.structuring.realtime_write,
+                atomic_block_undo=config.insertion.atomic_block_undo,
+                undo_max_chars=config.insertion.undo_max_chars,
+            ),
+            lexicon=lexicon,
+        )
 
 
 class SpeechToStructuredTextPipeline:
@@ -35,22 +88,65 @@ class SpeechToStructuredTextPipeline:
         self.config = config
         self.deps = deps
         self._segment_counter = 0
+        # Components built here (rather than injected) are stopped by close().
+        self._owns_profiler = deps.profiler is None
+        self.profiler = deps.profiler or PipelineProfiler(config.profiling)
+        self.recorder = deps.recorder
+        if self.recorder is None and config.recording.enabled:
+            self.recorder = SessionRecorder.for_config(config.recording)
+        self._chunk_index: int | None = None
+        self.command_handlers: Dict[str, Callable[[LexiconMatch], None]] = {}
+        self.live_transcript: TranscriptResult | None = None
+        self.subtitle_handlers: List[Callable[[TranscriptResult], None]] = []
+        self.scheduler = deps.scheduler
+        self._owns_scheduler = deps.scheduler is None
+        if self.scheduler is None and config.scheduler.enabled:
+            self.scheduler = PriorityScheduler(
+                workers=config.scheduler.workers,
+                live_reserved_workers=config.scheduler.live_reserved_workers,
+            )
+        self._pending_reload: PreparedReload | None = None
+        deps.vad.add_listener(self._on_segment_event)
 
     def process_stream(self, chunks: Sequence[AudioChunk]) -> str:
         logger.debug("Starting stream processing for %d chunks", len(chunks))
         output_text = ""
         for index, chunk in enumerate(chunks):
-            logger.debug(
-                "Processing chunk %d at %dms with %d samples", index, chunk.timestamp_ms, len(chunk.samples)
-            )
+            output_text = self.process_chunk(chunk, index)
+        output_text = self.finish(output_text)
+        logger.debug("Finished stream processing with %d characters", len(output_text))
+        return output_text
+
+    def process_chunk(self, chunk: AudioChunk, index: int) -> str:
+        """Feed one live chunk; returns the merged text so far."""
+
+        logger.debug(
+            "Processing chunk %d at %dms with %d samples", index, chunk.timestamp_ms, len(chunk.samples)
+        )
+        if self.recorder is not None:
+            self.recorder.record_chunk(index, chunk)
+        self._chunk_index = index
+        with self.profiler.stage("process_chunk"):
             segments = self.deps.vad.process_chunk(chunk, index)
-            logger.debug("Chunk %d produced %d segments", index, len(segments))
-            output_text = self._handle_segments(segments)
+        logger.debug("Chunk %d produced %d segments", index, len(segments))
+        output_text = self._handle_segments(segments)
+        if self._pending_reload is not None and not self.deps.vad.is_active:
+            self._apply_reload()
+        return output_text
+
+    def finish(self, output_text: str = "") -> str:
+        """Flush the VAD and wait for outstanding work at the end of a stream."""
+
+        self._chunk_index = None
         trailing = self.deps.vad.flush()
         if trailing:
             logger.debug("Flushing VAD produced %d trailing segments", len(trailing))
             output_text = self._handle_segments(trailing, final=True)
-        logger.debug("Finished stream processing with %d characters", len(output_text))
+        if self.scheduler is not None:
+            self.scheduler.drain()
+            output_text = self.deps.merger.aggregated_text
+        if self.recorder is not None:
+            self.recorder.flush()
         return output_text
 
     # ------------------------------------------------------------------
@@ -65,21 +161,106 @@ class SpeechToStructuredTextPipeline:
                 segment.end_ms,
                 segment.chunk_indices,
             )
-            transcript = self.deps.asr.transcribe_segment(segment)
-            logger.debug("Transcript generated (%d chars)", len(transcript.text))
+            if self.recorder is not None:
+                self.recorder.record_segment(segment, self._chunk_index)
+            if self.scheduler is not None:
+                # Final work keeps submission order; the merged text is read
+                # back once the scheduler drains.
+                self.scheduler.submit_final(partial(self._process_segment, segment, final, self.deps.asr))
+            else:
+                merged = self._process_segment(segment, final, self.deps.asr)
+        return merged
+
+    def _process_segment(self, segment: SpeechSegment, final: bool, asr: DoubaoASRClient) -> str:
+        recorder = self.recorder
+        with self.profiler.stage("transcribe_segment"):
+            transcript = asr.transcribe_segment(segment)
+        if recorder is not None:
+            recorder.record_transcript(transcript)
+        if self.deps.lexicon is not None:
+            self._route_commands(transcript.text)
+        logger.debug("Transcript generated (%d chars)", len(transcript.text))
+        with self.profiler.stage("structure"):
             structured = self.deps.llm.structure(transcript.text)
-            logger.debug("Structured topic: %s; %d points; %d actions", structured.topic, len(structured.points), len(structured.actions))
+        if recorder is not None:
+            recorder.record_structured(structured)
+        logger.debug("Structured topic: %s; %d points; %d actions", structured.topic, len(structured.points), len(structured.actions))
+        with self.profiler.stage("render"):
             rendered = self.deps.renderer.render(
                 structured, template_name=self.config.structuring.default_template
             )
-            self._segment_counter += 1
-            logger.debug("Merging segment #%d", self._segment_counter)
-            merged = self.deps.merger.merge(self._segment_counter, rendered)
-            self.deps.insertion.stage(merged, final=final or self.config.structuring.realtime_write)
+        if recorder is not None:
+            recorder.record_rendered(rendered)
+        self._segment_counter += 1
+        logger.debug("Merging segment #%d", self._segment_counter)
+        merged = self.deps.merger.merge(self._segment_counter, rendered)
+        commit_final = final or self.config.structuring.realtime_write
+        previous_op = self.deps.insertion.journal.peek()
+        with self.profiler.stage("commit"):
+            self.deps.insertion.stage(merged, final=commit_final)
+        if recorder is not None:
+            operation = self.deps.insertion.journal.peek()
+            recorder.record_insert(merged, commit_final, operation if operation is not previous_op else None)
         return merged
 
+    def stage_reload(self, prepared: PreparedReload) -> None:
+        """Queue a prepared reload; it is applied at the next segment boundary."""
+
+        self._pending_reload = prepared
+
+    def _apply_reload(self) -> None:
+        prepared, self._pending_reload = self._pending_reload, None
+        if prepared is None:
+            return
+        # VAD and streaming ASR switch here, together; queued segments keep
+        # the ASR bound at submission.  The rest is ordered behind them so no
+        # segment sees a mix.
+        apply_stream(self, prepared)
+        if self.scheduler is not None:
+            self.scheduler.submit_final(partial(apply_components, self, prepared))
+        else:
+            apply_components(self, prepared)
+
+    def _on_segment_event(self, event: SegmentEvent) -> None:
+        # Audio is handed to the ASR stream inline; only publishing the
+        # subtitle is deferred so a newer partial can supersede a stale one.
+        result = self.deps.asr.handle_event(event)
+        if result is None:
+            return
+        if self.scheduler is not None:
+            self.scheduler.submit_live("subtitle", partial(self._publish_live, result))
+        else:
+            self._publish_live(result)
+
+    def _publish_live(self, result: TranscriptResult) -> None:
+        self.live_transcript = result
+        for handler in self.subtitle_handlers:
+            handler(result)
+
+    def _route_commands(self, text: str) -> None:
+        for match in self.deps.lexicon.commands(text):  # type: ignore[union-attr]
+            handler = self.command_handlers.get(match.value)
+            if handler is None:
+                logger.debug("No handler registered for voice command '%s'", match.value)
+                continue
+            logger.debug("Routing voice command '%s' at %d", match.value, match.start)
+            handler(match)
+
+    def close(self) -> None:
+        """Stop background threads this pipeline started; injected ones are left running."""
+
+        if self._owns_scheduler and self.scheduler is not None:
+            self.scheduler.close()
+        if self._owns_profiler:
+            self.profiler.stop()
+
     def undo_last_insert(self) -> None:
         logger.debug("Undo requested – resetting pipeline state")
+        if self.scheduler is not None:
+            self.scheduler.drain()
         self.deps.insertion.undo_last()
         self.deps.merger.reset()
+        if self.deps.llm.context is not None:
+            # The undone text must not keep feeding later prompts.
+            self.deps.llm.context.reset()
         self._segment_counter = 0
@@ -0,0 +1,296 @@
+"""Runtime profiling hooks for the speech → structured text pipeline.
+
+The profiler is off by default and can be toggled at runtime (config or
+hotkey).  While enabled it combines three cheap signals:
+
+- per-stage wall/CPU time measured with :func:`time.perf_counter` and
+  :func:`time.thread_time` around each instrumented call;
+- a background sampling thread that inspects the stacks of pipeline threads
+  every ``sample_interval_ms`` and attributes each sample to the active stage;
+- ``tracemalloc`` net allocation per call, with a full snapshot diff taken only
+  on every ``snapshot_every``-th call of a stage.
+
+See ``docs/Profiling.md`` for the overhead budget of each signal.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from .config import ProfilingConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Aggregated measurements for one pipeline stage."""
+
+    calls: int = 0
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    samples: int = 0
+    alloc_net_bytes: int = 0
+    alloc_max_bytes: int = 0
+    snapshots: int = 0
+    hot_frames: Counter = field(default_factory=Counter)
+    alloc_sites: Counter = field(default_factory=Counter)
+
+    def to_dict(self, top_n: int) -> Dict[str, object]:
+        data = asdict(self)
+        data["hot_frames"] = self.hot_frames.most_common(top_n)
+        data["alloc_sites"] = self.alloc_sites.most_common(top_n)
+        return data
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageTimer:
+    __slots__ = ("_profiler", "_name", "_snapshot", "_wall", "_cpu", "_traced", "_traced_start")
+
+    def __init__(self, profiler: "PipelineProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._traced_start = 0
+
+    def __enter__(self) -> None:
+        profiler = self._profiler
+        profiler._push_stage(self._name)
+        self._traced = tracemalloc.is_tracing()
+        if self._traced:
+            if profiler._should_snapshot(self._name):
+                self._snapshot = tracemalloc.take_snapshot()
+            self._traced_start = tracemalloc.get_traced_memory()[0]
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        wall_ms = (time.perf_counter() - self._wall) * 1000.0
+        cpu_ms = (time.thread_time() - self._cpu) * 1000.0
+        alloc = 0
+        sites: List[tuple[str, int]] = []
+        if self._traced and tracemalloc.is_tracing():
+            alloc = tracemalloc.get_traced_memory()[0] - self._traced_start
+            if self._snapshot is not None:
+                after = tracemalloc.take_snapshot()
+                for stat in after.compare_to(self._snapshot, "lineno")[: self._profiler.config.top_n]:
+                    if stat.size_diff > 0:
+                        frame = stat.traceback[0]
+                        sites.append((f"{frame.filename}:{frame.lineno}", stat.size_diff))
+        self._profiler._pop_stage(self._name, wall_ms, cpu_ms, alloc, sites, self._snapshot is not None)
+
+
+class PipelineProfiler:
+    """Collects per-stage CPU and allocation reports for diagnostics bundles."""
+
+    def __init__(self, config: ProfilingConfig | None = None) -> None:
+        self.config = config or ProfilingConfig()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StageStats] = {}
+        self._active: Dict[int, List[str]] = {}
+        self._enabled = False
+        self._started_tracemalloc = False
+        self._sampler: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._sampler_cpu_s = 0.0
+        self._enabled_at = 0.0
+        self._enabled_s = 0.0
+        if self.config.enabled:
+            self.start()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def start(self) -> None:
+        if self._enabled:
+            return
+        logger.info(
+            "Starting pipeline profiler (interval=%dms, tracemalloc=%s)",
+            self.config.sample_interval_ms,
+            self.config.tracemalloc,
+        )
+        if self.config.tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(self.config.tracemalloc_frames)
+            self._started_tracemalloc = True
+        self._enabled = True
+        self._enabled_at = time.perf_counter()
+        if self.config.sample_interval_ms > 0:
+            self._stop_event.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="vtsw-profiler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        if not self._enabled:
+            return
+        logger.info("Stopping pipeline profiler")
+        self._enabled = False
+        self._enabled_s += time.perf_counter() - self._enabled_at
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def toggle(self) -> bool:
+        """Flip the profiler on/off (bound to ``hotkeys.toggle_profiling``)."""
+
+        if self._enabled:
+            self.stop()
+        else:
+            self.start()
+        return self._enabled
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._sampler_cpu_s = 0.0
+            self._enabled_s = 0.0
+            self._enabled_at = time.perf_counter()
+
+    def stage(self, name: str) -> _StageTimer | _NullStage:
+        """Return a context manager measuring *name*; a no-op when disabled."""
+
+        if not self._enabled:
+            return _NULL_STAGE
+        return _StageTimer(self, name)
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            stages = {name: stats.to_dict(self.config.top_n) for name, stats in self._stats.items()}
+            enabled_s = self._enabled_s + (time.perf_counter() - self._enabled_at if self._enabled else 0.0)
+            sampler_cpu_ms = self._sampler_cpu_s * 1000.0
+        return {
+            "enabled_s": round(enabled_s, 3),
+            "sample_interval_ms": self.config.sample_interval_ms,
+            "sampler_cpu_ms": round(sampler_cpu_ms, 3),
+            "stages": stages,
+        }
+
+    def write_reports(self, directory: Path | None = None) -> List[Path]:
+        """Write CPU and allocation reports where the diagnostics script collects them."""
+
+        target = Path(directory or self.config.output_dir)
+        target.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        json_path = target / f"profile_{stamp}.json"
+        cpu_path = target / f"profile_cpu_{stamp}.log"
+        alloc_path = target / f"profile_alloc_{stamp}.log"
+        json_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        cpu_path.write_text(self._format_cpu(report), encoding="utf-8")
+        alloc_path.write_text(self._format_alloc(report), encoding="utf-8")
+        logger.info("Wrote profiling reports to %s", target)
+        return [json_path, cpu_path, alloc_path]
+
+    # ------------------------------------------------------------------
+    def _push_stage(self, name: str) -> None:
+        # Stack edits share the sampler's lock so it never sees a half-popped stack.
+        with self._lock:
+            self._active.setdefault(threading.get_ident(), []).append(name)
+
+    def _pop_stage(
+        self,
+        name: str,
+        wall_ms: float,
+        cpu_ms: float,
+        alloc: int,
+        sites: List[tuple[str, int]],
+        snapshotted: bool,
+    ) -> None:
+        with self._lock:
+            stack = self._active.get(threading.get_ident())
+            if stack:
+                stack.pop()
+            stats = self._stats.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.wall_ms += wall_ms
+            stats.cpu_ms += cpu_ms
+            stats.alloc_net_bytes += alloc
+            stats.alloc_max_bytes = max(stats.alloc_max_bytes, alloc)
+            if snapshotted:
+                stats.snapshots += 1
+                stats.alloc_sites.update(dict(sites))
+
+    def _should_snapshot(self, name: str) -> bool:
+        every = self.config.snapshot_every
+        if every <= 0:
+            return False
+        stats = self._stats.get(name)
+        return (stats.calls if stats else 0) % every == 0
+
+    def _sample_loop(self) -> None:
+        interval = self.config.sample_interval_ms / 1000.0
+        own = threading.get_ident()
+        while not self._stop_event.wait(interval):
+            started = time.thread_time()
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, stack in list(self._active.items()):
+                    if ident == own or not stack:
+                        continue
+                    frame = frames.get(ident)
+                    if frame is None:
+                        continue
+                    stats = self._stats.setdefault(stack[-1], StageStats())
+                    stats.samples += 1
+                    code = frame.f_code
+                    stats.hot_frames[f"{code.co_filename}:{frame.f_lineno} {code.co_name}"] += 1
+                self._sampler_cpu_s += time.thread_time() - started
+            del frames
+
+    def _format_cpu(self, report: Dict[str, object]) -> str:
+        lines = [
+            f"enabled_s={report['enabled_s']} sample_interval_ms={report['sample_interval_ms']} "
+            f"sampler_cpu_ms={report['sampler_cpu_ms']}",
+            "",
+            f"{'stage':<20}{'calls':>8}{'wall_ms':>12}{'cpu_ms':>12}{'samples':>10}",
+        ]
+        stages: Dict[str, Dict[str, object]] = report["stages"]  # type: ignore[assignment]
+        for name, stats in stages.items():
+            lines.append(
+                f"{name:<20}{stats['calls']:>8}{stats['wall_ms']:>12.2f}{stats['cpu_ms']:>12.2f}{stats['samples']:>10}"
+            )
+        for name, stats in stages.items():
+            if stats["hot_frames"]:
+                lines.extend(["", f"[{name}] hot frames"])
+                lines.extend(f"  {count:>6}  {where}" for where, count in stats["hot_frames"])
+        return "\n".join(lines) + "\n"
+
+    def _format_alloc(self, report: Dict[str, object]) -> str:
+        lines = [f"{'stage':<20}{'calls':>8}{'net_bytes':>14}{'max_bytes':>12}{'snapshots':>11}"]
+        stages: Dict[str, Dict[str, object]] = report["stages"]  # type: ignore[assignment]
+        for name, stats in stages.items():
+            lines.append(
+                f"{name:<20}{stats['calls']:>8}{stats['alloc_net_bytes']:>14}"
+                f"{stats['alloc_max_bytes']:>12}{stats['snapshots']:>11}"
+            )
+        for name, stats in stages.items():
+            if stats["alloc_sites"]:
+                lines.extend(["", f"[{name}] allocation sites (sampled snapshots)"])
+                lines.extend(f"  {size:>10}  {where}" for where, size in stats["alloc_sites"])
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,386 @@
+"""Record-and-replay capture of pipeline sessions.
+
+A session log is an append-only binary file: an 8 byte magic header followed
+by length-prefixed records ``<kind:u8><length:u32><zlib payload>``.  Each
+payload is a JSON document; audio records append their samples as packed
+little-endian float32 after the JSON so chunks stay compact.  A truncated tail
+(for example after a crash) is ignored on read.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import asdict, dataclass, field, replace
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from .asr import TranscriptResult
+from .audio import AudioChunk, SegmentEvent, SpeechSegment
+from .config import RecordingConfig
+from .insertion import UndoJournal, UndoOperation
+from .llm import ActionItem, StructuredSegment
+from .signal_stats import SignalStats
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .pipeline import SpeechToStructuredTextPipeline
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VTSWREC\x01"
+_HEADER = struct.Struct("<BI")
+_JSON_LEN = struct.Struct("<I")
+
+
+class RecordKind(IntEnum):
+    CHUNK = 1
+    SEGMENT = 2
+    TRANSCRIPT = 3
+    STRUCTURED = 4
+    RENDERED = 5
+    INSERT = 6
+
+
+def _pack_samples(samples: Sequence[float]) -> bytes:
+    packed = array("f", samples)
+    if sys.byteorder != "little":  # pragma: no cover - all supported targets are little-endian
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_samples(data: bytes) -> Tuple[float, ...]:
+    packed = array("f")
+    packed.frombytes(data)
+    if sys.byteorder != "little":  # pragma: no cover
+        packed.byteswap()
+    return tuple(packed)
+
+
+class SessionRecorder:
+    """Appends every pipeline input and stage output to a session log."""
+
+    def __init__(self, stream: BinaryIO, compress_level: int = 6) -> None:
+        self._stream = stream
+        self.compress_level = compress_level
+        self.records = 0
+        # Stage outputs may be written from scheduler workers.
+        self._lock = threading.Lock()
+        # Merged drafts grow with the session, so only their delta is logged.
+        self._merged = UndoJournal(max_chars=0)
+        if stream.tell() == 0:
+            stream.write(MAGIC)
+
+    @classmethod
+    def open(cls, path: Path, compress_level: int = 6) -> "SessionRecorder":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info("Recording pipeline session to %s", path)
+        return cls(path.open("ab"), compress_level=compress_level)
+
+    @classmethod
+    def for_config(cls, config: RecordingConfig) -> "SessionRecorder":
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        return cls.open(Path(config.output_dir) / f"session_{stamp}.vtswrec", config.compress_level)
+
+    def record_chunk(self, index: int, chunk: AudioChunk) -> None:
+        meta = {"index": index, "timestamp_ms": chunk.timestamp_ms, "transcript_hint": chunk.transcript_hint}
+        self._write(RecordKind.CHUNK, meta, chunk.samples)
+
+    def record_segment(self, segment: SpeechSegment, chunk_index: int | None) -> None:
+        meta = {
+            "chunk_index": chunk_index,
+            "start_ms": segment.start_ms,
+            "end_ms": segment.end_ms,
+            "transcript_hint": segment.transcript_hint,
+            "chunk_indices": list(segment.chunk_indices),
+            # Stored at full precision; recomputing from float32 samples drifts.
+            "stats": asdict(segment.signal_stats()),
+        }
+        self._write(RecordKind.SEGMENT, meta, segment.samples)
+
+    def record_transcript(self, result: TranscriptResult) -> None:
+        meta = {"text": result.text, "is_final": result.is_final, "confidence": result.confidence}
+        self._write(RecordKind.TRANSCRIPT, meta)
+
+    def record_structured(self, structured: StructuredSegment) -> None:
+        meta = {
+            "topic": structured.topic,
+            "points": list(structured.points),
+            "actions": [
+                {"owner": action.owner, "description": action.description, "due": action.due}
+                for action in structured.actions
+            ],
+        }
+        self._write(RecordKind.STRUCTURED, meta)
+
+    def record_rendered(self, text: str) -> None:
+        self._write(RecordKind.RENDERED, {"text": text})
+
+    def record_insert(self, merged: str, final: bool, operation: UndoOperation | None) -> None:
+        with self._lock:
+            delta = self._merged.record(merged)
+        meta: Dict[str, object] = {
+            "merged": [delta.offset, delta.removed_length, delta.inserted],
+            "final": final,
+            "op": None,
+        }
+        if operation is not None:
+            meta["op"] = {
+                "offset": operation.offset,
+                "removed": operation.removed,
+                "inserted": operation.inserted,
+                "strategy": operation.strategy,
+            }
+        self._write(RecordKind.INSERT, meta)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._stream.flush()
+
+    def close(self) -> None:
+        self._stream.close()
+
+    # ------------------------------------------------------------------
+    def _write(self, kind: RecordKind, meta: Mapping[str, object], samples: Sequence[float] | None = None) -> None:
+        encoded = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload = _JSON_LEN.pack(len(encoded)) + encoded
+        if samples is not None:
+            payload += _pack_samples(samples)
+        body = zlib.compress(payload, self.compress_level)
+        with self._lock:
+            self._stream.write(_HEADER.pack(kind, len(body)) + body)
+            self.records += 1
+
+
+def iter_records(path: Path) -> Iterator[Tuple[RecordKind, Dict[str, object], Tuple[float, ...]]]:
+    """Yield ``(kind, meta, samples)`` for every complete record in *path*."""
+
+    with path.open("rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a VTSW session log.")
+        while True:
+            header = handle.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            kind, length = _HEADER.unpack(header)
+            body = handle.read(length)
+            if len(body) < length:
+                logger.warning("Ignoring truncated record at end of %s", path)
+                return
+            payload = zlib.decompress(body)
+            (json_len,) = _JSON_LEN.unpack_from(payload)
+            meta = json.loads(payload[_JSON_LEN.size : _JSON_LEN.size + json_len].decode("utf-8"))
+            samples = _unpack_samples(payload[_JSON_LEN.size + json_len :])
+            yield RecordKind(kind), meta, samples
+
+
+@dataclass(slots=True)
+class RecordedSession:
+    """In-memory view of a session log, grouped by stage."""
+
+    chunks: List[AudioChunk] = field(default_factory=list)
+    segments: List[SpeechSegment] = field(default_factory=list)
+    segment_sources: List[int | None] = field(default_factory=list)
+    transcripts: List[TranscriptResult] = field(default_factory=list)
+    structured: List[StructuredSegment] = field(default_factory=list)
+    rendered: List[str] = field(default_factory=list)
+    inserts: List[Tuple[str, bool, UndoOperation | None]] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "RecordedSession":
+        session = cls()
+        merged = ""
+        for kind, meta, samples in iter_records(path):
+            if kind is RecordKind.CHUNK:
+                session.chunks.append(
+                    AudioChunk(meta["timestamp_ms"], samples, meta["transcript_hint"])  # type: ignore[arg-type]
+                )
+            elif kind is RecordKind.SEGMENT:
+                session.segments.append(
+                    SpeechSegment(
+                        start_ms=meta["start_ms"],  # type: ignore[arg-type]
+                        end_ms=meta["end_ms"],  # type: ignore[arg-type]
+                        samples=samples,
+                        transcript_hint=meta["transcript_hint"],  # type: ignore[arg-type]
+                        chunk_indices=list(meta["chunk_indices"]),  # type: ignore[call-overload]
+                        stats=SignalStats(**meta["stats"]) if meta.get("stats") else None,  # type: ignore[arg-type]
+                    )
+                )
+                # Re-key to the chunk position in the log so several streams
+                # recorded into one file replay as a single stream.
+                source = None if meta["chunk_index"] is None else len(session.chunks) - 1
+                session.segment_sources.append(source)
+            elif kind is RecordKind.TRANSCRIPT:
+                session.transcripts.append(TranscriptResult(**meta))  # type: ignore[arg-type]
+            elif kind is RecordKind.STRUCTURED:
+                session.structured.append(
+                    StructuredSegment(
+                        topic=meta["topic"],  # type: ignore[arg-type]
+                        points=tuple(meta["points"]),  # type: ignore[call-overload]
+                        actions=tuple(ActionItem(**action) for action in meta["actions"]),  # type: ignore[attr-defined]
+                    )
+                )
+            elif kind is RecordKind.RENDERED:
+                session.rendered.append(meta["text"])  # type: ignore[arg-type]
+            elif kind is RecordKind.INSERT:
+                offset, removed_length, inserted = meta["merged"]  # type: ignore[misc]
+                merged = merged[:offset] + inserted + merged[offset + removed_length :]
+                op = meta["op"]
+                operation = UndoOperation(**op) if isinstance(op, dict) else None
+                session.inserts.append((merged, bool(meta["final"]), operation))
+        logger.debug(
+            "Loaded session %s: %d chunks, %d segments, %d inserts",
+            path,
+            len(session.chunks),
+            len(session.segments),
+            len(session.inserts),
+        )
+        return session
+
+
+class _RecordedVAD:
+    def __init__(self, session: RecordedSession) -> None:
+        self._by_chunk: Dict[int | None, List[SpeechSegment]] = {}
+        for segment, source in zip(session.segments, session.segment_sources):
+            self._by_chunk.setdefault(source, []).append(segment)
+
+    def process_chunk(self, chunk: AudioChunk, chunk_index: int) -> List[SpeechSegment]:
+        return list(self._by_chunk.get(chunk_index, ()))
+
+    def flush(self) -> List[SpeechSegment]:
+        return list(self._by_chunk.get(None, ()))
+
+    def reset(self) -> None:
+        return None
+
+    def add_listener(self, listener: Callable[[SegmentEvent], None]) -> None:
+        return None
+
+    def remove_listener(self, listener: Callable[[SegmentEvent], None]) -> None:
+        return None
+
+    @property
+    def is_active(self) -> bool:
+        return False
+
+
+class _RecordedASR:
+    def __init__(self, session: RecordedSession) -> None:
+        self._results = iter(session.transcripts)
+
+    def handle_event(self, event: SegmentEvent) -> TranscriptResult | None:
+        return None
+
+    def transcribe_segment(self, segment: SpeechSegment) -> TranscriptResult:
+        return next(self._results)
+
+
+class _RecordedLLM:
+    def __init__(self, session: RecordedSession) -> None:
+        self._results = iter(session.structured)
+
+    def structure(self, transcript: str) -> StructuredSegment:
+        return next(self._results)
+
+
+class _RecordedRenderer:
+    def __init__(self, session: RecordedSession) -> None:
+        self._results = iter(session.rendered)
+
+    def render(self, segment: StructuredSegment, template_name: str = "generic") -> str:
+        return next(self._results)
+
+
+_SUBSTITUTES: Dict[str, Callable[[RecordedSession], object]] = {
+    "vad": _RecordedVAD,
+    "asr": _RecordedASR,
+    "llm": _RecordedLLM,
+    "renderer": _RecordedRenderer,
+}
+
+
+@dataclass(slots=True)
+class StageBenchmark:
+    stage: str
+    calls: int
+    total_ms: float
+
+    @property
+    def per_call_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class SessionReplayer:
+    """Feeds a recorded session back through a pipeline at maximum speed."""
+
+    def __init__(self, session: RecordedSession) -> None:
+        self.session = session
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SessionReplayer":
+        return cls(RecordedSession.load(path))
+
+    def replay(
+        self, pipeline: "SpeechToStructuredTextPipeline", substitute: Iterable[str] = ()
+    ) -> str:
+        """Run the recorded chunks through components built from *pipeline*'s config.
+
+        The replay gets its own VAD, ASR, merger and insertion controller from
+        ``PipelineDependencies.from_config``, so *pipeline*'s listeners and
+        stream state are left untouched; only its profiler and scheduler are
+        shared.  Stages named in *substitute* (``vad``, ``asr``, ``llm``,
+        ``renderer``) return the recorded outputs instead of recomputing them,
+        so the remaining stages see exactly the production inputs.
+        """
+
+        from .pipeline import PipelineDependencies, SpeechToStructuredTextPipeline
+
+        overrides = {}
+        for stage in substitute:
+            if stage not in _SUBSTITUTES:
+                raise ValueError(f"Stage '{stage}' cannot be substituted; choose from {sorted(_SUBSTITUTES)}.")
+            overrides[stage] = _SUBSTITUTES[stage](self.session)
+        deps = replace(
+            PipelineDependencies.from_config(pipeline.config),
+            profiler=pipeline.profiler,
+            scheduler=pipeline.scheduler,
+            **overrides,
+        )
+        replay_pipeline = SpeechToStructuredTextPipeline(pipeline.config, deps)
+        logger.debug("Replaying %d chunks (substitute=%s)", len(self.session.chunks), sorted(overrides))
+        try:
+            return replay_pipeline.process_stream(self.session.chunks)
+        finally:
+            replay_pipeline.close()
+
+    def stage_inputs(self, stage: str) -> Sequence[object]:
+        """Return the recorded inputs consumed by *stage*."""
+
+        inputs: Dict[str, Sequence[object]] = {
+            "vad": self.session.chunks,
+            "asr": self.session.segments,
+            "llm": [result.text for result in self.session.transcripts],
+            "renderer": self.session.structured,
+            "insertion": [merged for merged, _, _ in self.session.inserts],
+        }
+        if stage not in inputs:
+            raise ValueError(f"Unknown stage '{stage}'; choose from {sorted(inputs)}.")
+        return inputs[stage]
+
+    def benchmark_stage(self, stage: str, call: Callable[[object], object], repeat: int = 1) -> StageBenchmark:
+        """Time *call* over the recorded inputs of *stage* in isolation."""
+
+        inputs = self.stage_inputs(stage)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for item in inputs:
+                call(item)
+        total_ms = (time.perf_counter() - started) * 1000.0
+        return StageBenchmark(stage=stage, calls=len(inputs) * repeat, total_ms=total_ms)
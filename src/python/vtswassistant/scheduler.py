@@ -0,0 +1,168 @@
+"""Priority-aware worker pool for live subtitle and final structuring work."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Callable, Deque, Dict, List
+
+
+logger = logging.getLogger(__name__)
+
+LIVE = "live"
+FINAL = "final"
+
+
+@dataclass(slots=True)
+class PriorityClassStats:
+    submitted: int = 0
+    completed: int = 0
+    superseded: int = 0
+    failed: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        started = self.completed + self.failed
+        return self.total_wait_ms / started if started else 0.0
+
+
+@dataclass(slots=True)
+class _Task:
+    priority: str
+    run: Callable[[], object]
+    enqueued_at: float
+
+
+class PriorityScheduler:
+    """Runs live work ahead of final work on a small thread pool.
+
+    - Live tasks are keyed; submitting a newer task for a key that is still
+      queued replaces the stale one (counted as ``superseded``).
+    - Final tasks are always admitted and run in submission order with at most
+      ``final_concurrency`` in flight.
+    - Final work is capped at ``workers - live_reserved_workers`` threads (and
+      at ``final_concurrency``), so at least ``live_reserved_workers`` threads
+      are free for live updates even while structuring calls are running.
+    """
+
+    def __init__(self, workers: int = 2, live_reserved_workers: int = 1, final_concurrency: int = 1) -> None:
+        if workers <= live_reserved_workers:
+            raise ValueError("workers must exceed live_reserved_workers so final work can run.")
+        self._final_limit = max(1, min(final_concurrency, workers - live_reserved_workers))
+        self._cond = threading.Condition()
+        self._live: "OrderedDict[str, _Task]" = OrderedDict()
+        self._final: Deque[_Task] = deque()
+        self._final_running = 0
+        self._running = 0
+        self._closed = False
+        self._errors: List[BaseException] = []
+        self._stats: Dict[str, PriorityClassStats] = {LIVE: PriorityClassStats(), FINAL: PriorityClassStats()}
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"vtsw-worker-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit_live(self, key: str, task: Callable[[], object]) -> None:
+        with self._cond:
+            stats = self._stats[LIVE]
+            if self._live.pop(key, None) is not None:
+                stats.superseded += 1
+                logger.debug("Live task '%s' superseded before it ran", key)
+            self._live[key] = _Task(LIVE, task, time.perf_counter())
+            stats.submitted += 1
+            self._update_depth(LIVE, len(self._live))
+            self._cond.notify()
+
+    def submit_final(self, task: Callable[[], object]) -> None:
+        with self._cond:
+            self._final.append(_Task(FINAL, task, time.perf_counter()))
+            self._stats[FINAL].submitted += 1
+            self._update_depth(FINAL, len(self._final))
+            self._cond.notify()
+
+    def drain(self, timeout: float | None = None) -> None:
+        """Block until every queued task has run; re-raise the first task error."""
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            while self._live or self._final or self._running:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Scheduler did not drain in time.")
+                self._cond.wait(remaining)
+            if self._errors:
+                error = self._errors.pop(0)
+                self._errors.clear()
+                raise error
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def stats(self) -> Dict[str, PriorityClassStats]:
+        with self._cond:
+            return {name: replace(stats) for name, stats in self._stats.items()}
+
+    # ------------------------------------------------------------------
+    def _update_depth(self, priority: str, depth: int) -> None:
+        stats = self._stats[priority]
+        stats.queue_depth = depth
+        stats.max_queue_depth = max(stats.max_queue_depth, depth)
+
+    def _next_task(self) -> _Task | None:
+        if self._live:
+            _, task = self._live.popitem(last=False)
+            self._update_depth(LIVE, len(self._live))
+            return task
+        if self._final and self._final_running < self._final_limit:
+            task = self._final.popleft()
+            self._final_running += 1
+            self._update_depth(FINAL, len(self._final))
+            return task
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    task = self._next_task()
+                self._running += 1
+                wait_ms = (time.perf_counter() - task.enqueued_at) * 1000.0
+                stats = self._stats[task.priority]
+                stats.total_wait_ms += wait_ms
+                stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+
+            failed = False
+            try:
+                task.run()
+            except BaseException as error:  # noqa: BLE001 - surfaced through drain()
+                logger.exception("%s task failed", task.priority)
+                failed = True
+                with self._cond:
+                    self._errors.append(error)
+
+            with self._cond:
+                self._running -= 1
+                if task.priority == FINAL:
+                    self._final_running -= 1
+                if failed:
+                    stats.failed += 1
+                else:
+                    stats.completed += 1
+                self._cond.notify_all()
@@ -0,0 +1,126 @@
+"""Signal statistics for speech segments.
+
+:class:`SignalStats` summarises a block of samples (RMS, peak, mean absolute
+amplitude, voiced-frame ratio) in one pass.  The VAD computes it once when it
+closes a segment and stores it on :class:`~vtswassistant.audio.SpeechSegment`,
+so the ASR fallback, confidence and quality checks read it instead of
+re-scanning the samples.
+
+:class:`FrameStats` is the frame-level API: it builds prefix sums once and then
+answers statistics for any frame window in constant time (the peak is the only
+per-window scan).
+
+``numpy`` is used when installed; otherwise the passes run on C-level
+builtins (``map``/``sum``/``max``) rather than per-sample Python loops.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import List, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - pure-Python fallback
+    np = None
+
+
+DEFAULT_VOICED_THRESHOLD = 0.5
+
+
+@dataclass(slots=True, frozen=True)
+class SignalStats:
+    """Summary of a block of frames; magnitudes are ``abs(sample)``."""
+
+    frame_count: int = 0
+    rms: float = 0.0
+    peak: float = 0.0
+    mean_amplitude: float = 0.0
+    voiced_ratio: float = 0.0
+    voiced_threshold: float = DEFAULT_VOICED_THRESHOLD
+
+    @property
+    def voiced_frames(self) -> int:
+        return round(self.voiced_ratio * self.frame_count)
+
+    @classmethod
+    def compute(cls, samples: Sequence[float], voiced_threshold: float = DEFAULT_VOICED_THRESHOLD) -> "SignalStats":
+        count = len(samples)
+        if not count:
+            return cls(voiced_threshold=voiced_threshold)
+        if np is not None:
+            magnitudes = np.abs(np.asarray(samples, dtype=np.float64))
+            energy = float(np.dot(magnitudes, magnitudes))
+            total = float(magnitudes.sum())
+            peak = float(magnitudes.max())
+            voiced = int(np.count_nonzero(magnitudes >= voiced_threshold))
+        else:
+            magnitudes = list(map(abs, samples))
+            energy = sum(map(operator.mul, magnitudes, magnitudes))
+            total = sum(magnitudes)
+            peak = max(magnitudes)
+            voiced = sum(map(float(voiced_threshold).__le__, magnitudes))
+        return cls(
+            frame_count=count,
+            rms=math.sqrt(energy / count),
+            peak=peak,
+            mean_amplitude=total / count,
+            voiced_ratio=voiced / count,
+            voiced_threshold=voiced_threshold,
+        )
+
+
+class FrameStats:
+    """Constant-time statistics over arbitrary frame windows of one signal."""
+
+    __slots__ = ("voiced_threshold", "_magnitudes", "_sum", "_energy", "_voiced")
+
+    def __init__(self, samples: Sequence[float], voiced_threshold: float = DEFAULT_VOICED_THRESHOLD) -> None:
+        self.voiced_threshold = voiced_threshold
+        if np is not None:
+            magnitudes = np.abs(np.asarray(samples, dtype=np.float64))
+            zero = np.zeros(1)
+            self._magnitudes = magnitudes
+            self._sum = np.concatenate((zero, np.cumsum(magnitudes)))
+            self._energy = np.concatenate((zero, np.cumsum(magnitudes * magnitudes)))
+            self._voiced = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(magnitudes >= voiced_threshold)))
+        else:
+            magnitudes = list(map(abs, samples))
+            self._magnitudes = magnitudes
+            self._sum = list(accumulate(magnitudes, initial=0.0))
+            self._energy = list(accumulate(map(operator.mul, magnitudes, magnitudes), initial=0.0))
+            self._voiced = list(accumulate(map(float(voiced_threshold).__le__, magnitudes), initial=0))
+
+    def __len__(self) -> int:
+        return len(self._magnitudes)
+
+    def window(self, start: int = 0, stop: int | None = None) -> SignalStats:
+        """Statistics for frames ``[start, stop)``; bounds are clamped like slices."""
+
+        start, stop, _ = slice(start, stop).indices(len(self))
+        count = stop - start
+        if count <= 0:
+            return SignalStats(voiced_threshold=self.voiced_threshold)
+        energy = float(self._energy[stop] - self._energy[start])
+        window = self._magnitudes[start:stop]
+        return SignalStats(
+            frame_count=count,
+            rms=math.sqrt(max(0.0, energy) / count),
+            peak=float(window.max() if np is not None else max(window)),
+            mean_amplitude=float(self._sum[stop] - self._sum[start]) / count,
+            voiced_ratio=int(self._voiced[stop] - self._voiced[start]) / count,
+            voiced_threshold=self.voiced_threshold,
+        )
+
+    def frames(self, size: int, hop: int | None = None) -> List[SignalStats]:
+        """Statistics for consecutive windows of *size* frames every *hop* frames."""
+
+        if size <= 0:
+            raise ValueError("size must be positive.")
+        hop = hop or size
+        if not len(self):
+            return []
+        return [self.window(start, start + size) for start in range(0, max(1, len(self) - size + 1), hop)]
@@ -0,0 +1,343 @@
+"""Endurance (soak) harness for the P-003 CPU and memory targets.
+
+The harness feeds :class:`SpeechToStructuredTextPipeline` a synthetic
+dictation stream (speech bursts separated by pauses) for a configurable
+amount of audio time, paced in real time by default.  Every
+``sample_interval_s`` of audio it records:
+
+- process CPU time (all threads), minus the cost of sampling itself;
+- resident set size (``psutil`` when installed, ``/proc/self/statm`` otherwise);
+- ``sys.getallocatedblocks()`` and live instance counts of key pipeline types;
+- gauges of the buffers known to grow with the session (VAD buffers, merged
+  segments, undo journal).
+
+After a warm-up fraction is discarded, a least-squares slope is fitted to RSS
+and allocated blocks; the run fails when CPU share or either slope exceeds
+its threshold.  Results are written as a CSV time series plus a JSON summary.
+
+Run from the command line with ``python -m vtswassistant.soak``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .audio import AudioChunk
+from .config import Config, load_config
+from .pipeline import PipelineDependencies, SpeechToStructuredTextPipeline
+
+try:  # pragma: no cover - optional dependency
+    import psutil
+except ModuleNotFoundError:  # pragma: no cover - fallback below
+    psutil = None
+
+
+logger = logging.getLogger(__name__)
+
+TRACKED_TYPES: Tuple[str, ...] = (
+    "AudioChunk",
+    "SpeechSegment",
+    "SegmentEvent",
+    "TranscriptResult",
+    "StructuredSegment",
+    "UndoOperation",
+)
+
+SOAK_PHRASES: Tuple[str, ...] = (
+    "今天讨论发布计划，张三负责整理需求文档",
+    "下一步需要确认测试环境，李四跟进接口联调",
+    "客户反馈字幕延迟偏高，需要优化语音分段",
+    "周五之前完成回归测试并提交发布说明",
+)
+
+
+@dataclass(slots=True)
+class SoakSettings:
+    duration_s: float = 600.0
+    # 1.0 paces chunks in real time; 0 feeds them as fast as possible.
+    speed: float = 1.0
+    chunk_ms: int = 100
+    speech_ms: int = 2000
+    pause_ms: int = 1000
+    sample_interval_s: float = 10.0
+    warmup_fraction: float = 0.2
+    max_cpu_share: float = 0.15
+    max_rss_slope_kb_per_min: float = 512.0
+    max_blocks_slope_per_min: float = 2000.0
+    tracked_types: Tuple[str, ...] = TRACKED_TYPES
+    output_dir: str = "logs/soak"
+
+
+@dataclass(slots=True)
+class SoakSample:
+    audio_s: float
+    wall_s: float
+    cpu_s: float
+    rss_bytes: int
+    allocated_blocks: int
+    objects: Dict[str, int] = field(default_factory=dict)
+    gauges: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SoakResult:
+    settings: SoakSettings
+    samples: List[SoakSample]
+    cpu_s: float
+    audio_s: float
+    wall_s: float
+    rss_slope_kb_per_min: float
+    blocks_slope_per_min: float
+    object_slopes_per_min: Dict[str, float]
+    failures: List[str]
+
+    @property
+    def cpu_share(self) -> float:
+        return self.cpu_s / self.audio_s if self.audio_s else 0.0
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "passed": self.passed,
+            "failures": list(self.failures),
+            "audio_s": round(self.audio_s, 3),
+            "wall_s": round(self.wall_s, 3),
+            "cpu_s": round(self.cpu_s, 3),
+            "cpu_share": round(self.cpu_share, 4),
+            "rss_slope_kb_per_min": round(self.rss_slope_kb_per_min, 3),
+            "blocks_slope_per_min": round(self.blocks_slope_per_min, 3),
+            "object_slopes_per_min": {name: round(slope, 3) for name, slope in self.object_slopes_per_min.items()},
+            "settings": asdict(self.settings),
+        }
+
+    def write_report(self, directory: Path | None = None) -> List[Path]:
+        """Write ``soak_<ts>.csv`` (time series) and ``soak_<ts>.json`` (summary)."""
+
+        directory = Path(directory or self.settings.output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        csv_path = directory / f"soak_{stamp}.csv"
+        json_path = directory / f"soak_{stamp}.json"
+        object_names = sorted({name for sample in self.samples for name in sample.objects})
+        gauge_names = sorted({name for sample in self.samples for name in sample.gauges})
+        with csv_path.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(
+                ["audio_s", "wall_s", "cpu_s", "rss_bytes", "allocated_blocks", *object_names, *gauge_names]
+            )
+            for sample in self.samples:
+                writer.writerow(
+                    [
+                        f"{sample.audio_s:.3f}",
+                        f"{sample.wall_s:.3f}",
+                        f"{sample.cpu_s:.4f}",
+                        sample.rss_bytes,
+                        sample.allocated_blocks,
+                        *(sample.objects.get(name, 0) for name in object_names),
+                        *(sample.gauges.get(name, 0) for name in gauge_names),
+                    ]
+                )
+        json_path.write_text(json.dumps(self.summary(), ensure_ascii=False, indent=2), encoding="utf-8")
+        logger.info("Soak report written to %s and %s", csv_path, json_path)
+        return [csv_path, json_path]
+
+
+def synthetic_dictation(settings: SoakSettings, frame_ms: int) -> Iterator[AudioChunk]:
+    """Yield chunks alternating ``speech_ms`` of speech and ``pause_ms`` of silence."""
+
+    frames_per_chunk = max(1, settings.chunk_ms // frame_ms)
+    cycle_ms = settings.speech_ms + settings.pause_ms
+    total_ms = int(settings.duration_s * 1000)
+    speech = [0.8] * frames_per_chunk
+    silence = [0.02] * frames_per_chunk
+    for timestamp_ms in range(0, total_ms, settings.chunk_ms):
+        offset = timestamp_ms % cycle_ms
+        if offset >= settings.speech_ms:
+            yield AudioChunk(timestamp_ms=timestamp_ms, samples=silence)
+            continue
+        hint = SOAK_PHRASES[(timestamp_ms // cycle_ms) % len(SOAK_PHRASES)] if offset == 0 else ""
+        yield AudioChunk(timestamp_ms=timestamp_ms, samples=speech, transcript_hint=hint)
+
+
+def fit_slope(xs: Sequence[float], ys: Sequence[float]) -> float:
+    """Least-squares slope of *ys* over *xs* (0 with fewer than two points)."""
+
+    count = len(xs)
+    if count < 2:
+        return 0.0
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process, or 0 when no source is available."""
+
+    if psutil is not None:
+        return int(psutil.Process().memory_info().rss)
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return 0
+
+
+class SoakHarness:
+    """Drives a pipeline with synthetic dictation and checks resource trends."""
+
+    def __init__(self, pipeline: SpeechToStructuredTextPipeline, settings: SoakSettings | None = None) -> None:
+        self.pipeline = pipeline
+        self.settings = settings or SoakSettings()
+
+    def run(self) -> SoakResult:
+        settings = self.settings
+        frame_ms = self.pipeline.deps.vad.frame_ms
+        samples: List[SoakSample] = []
+        sampling_cpu = 0.0
+        next_sample_s = 0.0
+        audio_s = 0.0
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        logger.info("Soak run started: %.0fs of audio at speed %s", settings.duration_s, settings.speed or "max")
+
+        for index, chunk in enumerate(synthetic_dictation(settings, frame_ms)):
+            audio_s = chunk.timestamp_ms / 1000.0
+            if settings.speed > 0:
+                delay = wall_start + audio_s / settings.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if audio_s >= next_sample_s:
+                sample_start = time.process_time()
+                samples.append(self._sample(audio_s, wall_start, cpu_start, sampling_cpu))
+                sampling_cpu += time.process_time() - sample_start
+                next_sample_s += settings.sample_interval_s
+            self.pipeline.process_chunk(chunk, index)
+        self.pipeline.finish()
+        audio_s = settings.duration_s
+        samples.append(self._sample(audio_s, wall_start, cpu_start, sampling_cpu))
+
+        cpu_s = samples[-1].cpu_s
+        return self._evaluate(samples, cpu_s, audio_s, time.perf_counter() - wall_start)
+
+    # ------------------------------------------------------------------
+    def _sample(self, audio_s: float, wall_start: float, cpu_start: float, sampling_cpu: float) -> SoakSample:
+        cpu_s = time.process_time() - cpu_start - sampling_cpu
+        gc.collect()
+        tracked = set(self.settings.tracked_types)
+        objects = dict.fromkeys(self.settings.tracked_types, 0)
+        for obj in gc.get_objects():
+            name = type(obj).__name__
+            if name in tracked:
+                objects[name] += 1
+        return SoakSample(
+            audio_s=audio_s,
+            wall_s=time.perf_counter() - wall_start,
+            cpu_s=cpu_s,
+            rss_bytes=rss_bytes(),
+            allocated_blocks=sys.getallocatedblocks(),
+            objects=objects,
+            gauges=self._gauges(),
+        )
+
+    def _gauges(self) -> Dict[str, int]:
+        deps = self.pipeline.deps
+        gauges = {
+            "vad_buffered_frames": deps.vad.buffered_frames,
+            "merger_segments": deps.merger.segment_count,
+            "undo_ops": len(deps.insertion.journal),
+            "undo_chars": deps.insertion.journal.memory_chars,
+            "asr_open_streams": deps.asr.open_stream_count,
+        }
+        if deps.llm.context is not None:
+            gauges["context_tokens"] = deps.llm.context.window_tokens
+        return gauges
+
+    def _evaluate(self, samples: List[SoakSample], cpu_s: float, audio_s: float, wall_s: float) -> SoakResult:
+        settings = self.settings
+        steady = [sample for sample in samples if sample.audio_s >= settings.duration_s * settings.warmup_fraction]
+        minutes = [sample.audio_s / 60.0 for sample in steady]
+        rss_slope = fit_slope(minutes, [sample.rss_bytes / 1024.0 for sample in steady])
+        blocks_slope = fit_slope(minutes, [sample.allocated_blocks for sample in steady])
+        object_slopes = {
+            name: fit_slope(minutes, [sample.objects.get(name, 0) for sample in steady])
+            for name in settings.tracked_types
+        }
+        result = SoakResult(
+            settings=settings,
+            samples=samples,
+            cpu_s=cpu_s,
+            audio_s=audio_s,
+            wall_s=wall_s,
+            rss_slope_kb_per_min=rss_slope,
+            blocks_slope_per_min=blocks_slope,
+            object_slopes_per_min=object_slopes,
+            failures=[],
+        )
+        if result.cpu_share > settings.max_cpu_share:
+            result.failures.append(
+                f"CPU share {result.cpu_share:.1%} exceeds {settings.max_cpu_share:.0%} of audio time"
+            )
+        if rss_slope > settings.max_rss_slope_kb_per_min:
+            result.failures.append(
+                f"RSS grows {rss_slope:.1f} KB/min (limit {settings.max_rss_slope_kb_per_min:.1f})"
+            )
+        if blocks_slope > settings.max_blocks_slope_per_min:
+            result.failures.append(
+                f"Allocated blocks grow {blocks_slope:.0f}/min (limit {settings.max_blocks_slope_per_min:.0f})"
+            )
+        if not any(sample.rss_bytes for sample in samples):
+            logger.warning("RSS unavailable on this platform; install psutil for the RSS check")
+        for failure in result.failures:
+            logger.warning("Soak check failed: %s", failure)
+        logger.info(
+            "Soak run finished: cpu=%.1f%% rss_slope=%.1fKB/min blocks_slope=%.0f/min",
+            result.cpu_share * 100,
+            rss_slope,
+            blocks_slope,
+        )
+        return result
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    defaults = SoakSettings()
+    parser = argparse.ArgumentParser(description="Run the P-003 soak test against the local pipeline.")
+    parser.add_argument("--config", type=Path, help="Config file (defaults to built-in defaults).")
+    parser.add_argument("--duration", type=float, default=defaults.duration_s, help="Audio seconds to feed.")
+    parser.add_argument("--speed", type=float, default=defaults.speed, help="Pacing factor; 0 = unpaced.")
+    parser.add_argument("--interval", type=float, default=defaults.sample_interval_s, help="Sample interval (audio s).")
+    parser.add_argument("--output-dir", type=Path, default=Path(defaults.output_dir))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    config = load_config(args.config) if args.config else Config.from_mapping({})
+    pipeline = SpeechToStructuredTextPipeline(config, PipelineDependencies.from_config(config))
+    settings = SoakSettings(
+        duration_s=args.duration,
+        speed=args.speed,
+        sample_interval_s=args.interval,
+        output_dir=str(args.output_dir),
+    )
+    result = SoakHarness(pipeline, settings).run()
+    result.write_report()
+    print(json.dumps(result.summary(), ensure_ascii=False, indent=2))
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
@@ -36,6 +36,10 @@ class StructuredDraftMerger:
         logger.debug("Aggregated text now contains %d segments", len(self._segments))
         return "\n\n".join(self._segments)
 
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
     @property
     def aggregated_text(self) -> str:
         return "\n\n".join(self._segments)
@@ -3,32 +3,137 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
+from typing import Callable, Deque, List, Sequence, Tuple
 
-from .audio import AudioChunk, SpeechSegment
+from .audio import AudioChunk, SegmentEvent, SpeechSegment
+from .signal_stats import SignalStats
 
 
 logger = logging.getLogger(__name__)
 
+STATIC = "static"
+ADAPTIVE = "adaptive"
+
+
+@dataclass(slots=True)
+class VADMetrics:
+    """Running counters for the observation metrics in ``docs/VAD-Tuning.md``."""
+
+    segments: int = 0
+    short_segments: int = 0
+    forced_splits: int = 0
+    total_segment_ms: int = 0
+
+    @property
+    def mean_segment_ms(self) -> float:
+        return self.total_segment_ms / self.segments if self.segments else 0.0
+
+
+@dataclass(slots=True)
+class VADScore:
+    """Segmentation quality against labelled speech spans."""
+
+    false_segments: int
+    mean_segment_ms: float
+    tail_truncation_rate: float
+
 
 @dataclass(slots=True)
 class SileroVADSegmenter:
-    """A tiny VAD that mimics the behaviour described in the architecture docs."""
+    """A tiny VAD that mimics the behaviour described in the architecture docs.
+
+    In ``adaptive`` mode the static ``threshold`` becomes a lower bound: the
+    entry threshold follows an exponential average of the per-frame energy
+    during non-speech (``noise_floor + noise_margin``), the exit threshold sits
+    ``hysteresis`` of the way from the noise floor to the entry threshold, and
+    a segment only opens after ``min_speech_ms`` of consecutive speech.  While
+    a segment is open the floor is raised to the minimum frame energy of the
+    last ``noise_track_ms`` (minimum statistics), so sustained noise above the
+    entry threshold lifts the thresholds and closes the segment instead of
+    being split at ``max_segment_ms`` forever.
+
+    The last ``preroll_ms`` of non-speech audio is kept in a ring buffer and
+    prepended to each segment so word onsets are not clipped.  Listeners
+    registered with :meth:`add_listener` receive :class:`SegmentEvent` start,
+    append and end notifications while the segment is still open.
+    """
 
     threshold: float
     min_silence_ms: int
     max_segment_ms: int
     frame_ms: int
+    mode: str = STATIC
+    min_speech_ms: int = 60
+    noise_margin: float = 0.15
+    hysteresis: float = 0.5
+    noise_adapt_ms: int = 400
+    noise_track_ms: int = 2000
+    preroll_ms: int = 200
+    metrics: VADMetrics = field(default_factory=VADMetrics)
 
     _active: bool = field(init=False, default=False)
     _segment_start_ms: int = field(init=False, default=0)
     _segment_samples: List[float] = field(init=False, default_factory=list)
     _segment_transcript: List[str] = field(init=False, default_factory=list)
     _segment_chunks: List[int] = field(init=False, default_factory=list)
+    _segment_preroll: int = field(init=False, default=0)
     _silence_ms: int = field(init=False, default=0)
     _current_time_ms: int = field(init=False, default=0)
     _segment_index: int = field(init=False, default=0)
+    _noise_floor: float | None = field(init=False, default=None)
+    _track_frames: int = field(init=False, default=0)
+    _track_minima: Deque[Tuple[int, float]] = field(init=False, default_factory=deque)
+    _pending_start_ms: int = field(init=False, default=0)
+    _pending_samples: List[float] = field(init=False, default_factory=list)
+    _pending_transcript: List[str] = field(init=False, default_factory=list)
+    _pending_chunks: List[int] = field(init=False, default_factory=list)
+    _preroll: Deque[float] = field(init=False, default_factory=deque)
+    _emitted: int = field(init=False, default=0)
+    _listeners: List[Callable[[SegmentEvent], None]] = field(init=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._preroll = deque(maxlen=max(0, self.preroll_ms // max(1, self.frame_ms)))
+
+    @property
+    def is_active(self) -> bool:
+        """``True`` while a segment (or a speech candidate) is open."""
+
+        return self._active or bool(self._pending_samples)
+
+    @property
+    def buffered_frames(self) -> int:
+        """Frames currently held in the segment, candidate and pre-roll buffers."""
+
+        return len(self._segment_samples) + len(self._pending_samples) + len(self._preroll)
+
+    @property
+    def listeners(self) -> Tuple[Callable[[SegmentEvent], None], ...]:
+        return tuple(self._listeners)
+
+    def add_listener(self, listener: Callable[[SegmentEvent], None]) -> None:
+        """Subscribe to open-segment events (start, append, end)."""
+
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[SegmentEvent], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def adopt_state(self, previous: "SileroVADSegmenter") -> None:
+        """Carry warm state over from an idle *previous* segmenter.
+
+        Keeps the learned noise floor, clocks, segment numbering and the newest
+        pre-roll frames (up to this segmenter's ring size).
+        """
+
+        self._noise_floor = previous._noise_floor
+        self._current_time_ms = previous._current_time_ms
+        self._segment_start_ms = previous._segment_start_ms
+        self._segment_index = previous._segment_index
+        self._preroll.extend(previous._preroll)
 
     def reset(self) -> None:
         logger.debug("Resetting VAD state")
@@ -37,9 +142,33 @@ class SileroVADSegmenter:
         self._segment_samples.clear()
         self._segment_transcript.clear()
         self._segment_chunks.clear()
+        self._segment_preroll = 0
         self._silence_ms = 0
         self._current_time_ms = 0
         self._segment_index = 0
+        self._noise_floor = None
+        self._clear_tracking()
+        self._clear_pending()
+        self._preroll.clear()
+        self._emitted = 0
+
+    @property
+    def noise_floor(self) -> float:
+        return self._noise_floor or 0.0
+
+    def thresholds(self) -> Tuple[float, float]:
+        """Return the current ``(entry, exit)`` thresholds."""
+
+        if self.mode != ADAPTIVE:
+            return self.threshold, self.threshold
+        noise = self.noise_floor
+        entry = max(self.threshold, noise + self.noise_margin)
+        return entry, noise + self.hysteresis * (entry - noise)
+
+    def voiced_threshold(self) -> float:
+        """Magnitude counted as voiced in segment stats (the exit threshold when adaptive)."""
+
+        return self.thresholds()[1]
 
     def process_chunk(self, chunk: AudioChunk, chunk_index: int) -> List[SpeechSegment]:
         """Consume an audio chunk and return any completed speech segments."""
@@ -50,13 +179,12 @@ class SileroVADSegmenter:
             chunk.timestamp_ms,
             len(chunk.samples),
         )
-        if not self._active and chunk.has_speech(self.threshold):
-            self._start_segment(chunk.timestamp_ms, chunk_index, chunk.transcript_hint)
-        elif self._active and (not self._segment_chunks or self._segment_chunks[-1] != chunk_index):
-            # A continuing segment spanning multiple chunks.
-            self._segment_chunks.append(chunk_index)
-            if chunk.transcript_hint:
-                self._segment_transcript.append(chunk.transcript_hint.strip())
+        if self.mode == ADAPTIVE:
+            return self._process_adaptive(chunk, chunk_index)
+        if self._active:
+            # A continuing segment spanning multiple chunks.  New segments open
+            # at the first crossing frame so earlier frames stay in the pre-roll.
+            self._note_chunk(self._segment_chunks, self._segment_transcript, chunk_index, chunk.transcript_hint)
 
         segments: List[SpeechSegment] = []
         time_cursor = chunk.timestamp_ms
@@ -73,12 +201,15 @@ class SileroVADSegmenter:
                     if self._silence_ms >= self.min_silence_ms:
                         segments.append(self._close_segment(time_cursor))
                         continue
+                else:
+                    self._preroll.append(sample)
             time_cursor += self.frame_ms
             self._current_time_ms = time_cursor
 
             if self._active and self._segment_duration_ms() >= self.max_segment_ms:
-                segments.append(self._close_segment(time_cursor))
+                segments.append(self._close_segment(time_cursor, forced=True))
 
+        self._emit_append()
         if segments:
             logger.debug("Chunk %d produced %d segments", chunk_index, len(segments))
         return segments
@@ -93,31 +224,143 @@ class SileroVADSegmenter:
         return [self._close_segment(self._current_time_ms)]
 
     # ------------------------------------------------------------------
+    def _process_adaptive(self, chunk: AudioChunk, chunk_index: int) -> List[SpeechSegment]:
+        segments: List[SpeechSegment] = []
+        time_cursor = chunk.timestamp_ms
+        alpha = min(1.0, self.frame_ms / max(1, self.noise_adapt_ms))
+        if self._active:
+            self._note_chunk(self._segment_chunks, self._segment_transcript, chunk_index, chunk.transcript_hint)
+
+        for sample in chunk.samples:
+            energy = abs(sample)
+            entry, exit_ = self.thresholds()
+            if self._active:
+                self._track_noise(energy)
+                if energy >= exit_:
+                    self._segment_samples.append(sample)
+                    self._silence_ms = 0
+                else:
+                    self._silence_ms += self.frame_ms
+                    if self._silence_ms >= self.min_silence_ms:
+                        segments.append(self._close_segment(time_cursor))
+            elif energy >= entry:
+                if not self._pending_samples:
+                    self._pending_start_ms = time_cursor
+                self._note_chunk(self._pending_chunks, self._pending_transcript, chunk_index, chunk.transcript_hint)
+                self._pending_samples.append(sample)
+                if len(self._pending_samples) * self.frame_ms >= self.min_speech_ms:
+                    self._open_pending()
+            else:
+                if self._pending_samples:
+                    logger.debug("Discarding %d-frame speech candidate", len(self._pending_samples))
+                    self._preroll.extend(self._pending_samples)
+                    self._clear_pending()
+                self._preroll.append(sample)
+                if self._noise_floor is None:
+                    self._noise_floor = energy
+                else:
+                    self._noise_floor += alpha * (energy - self._noise_floor)
+            time_cursor += self.frame_ms
+            self._current_time_ms = time_cursor
+
+            if self._active and self._segment_duration_ms() >= self.max_segment_ms:
+                segments.append(self._close_segment(time_cursor, forced=True))
+
+        self._emit_append()
+        if segments:
+            logger.debug("Chunk %d produced %d segments", chunk_index, len(segments))
+        return segments
+
+    def _open_pending(self) -> None:
+        self._active = True
+        self._segment_start_ms = self._pending_start_ms - len(self._preroll) * self.frame_ms
+        self._segment_samples = [*self._preroll, *self._pending_samples]
+        self._segment_preroll = len(self._preroll)
+        self._segment_transcript = self._pending_transcript
+        self._segment_chunks = self._pending_chunks
+        self._silence_ms = 0
+        self._preroll.clear()
+        self._pending_samples, self._pending_transcript, self._pending_chunks = [], [], []
+        self._clear_tracking()
+        self._emit_start()
+        logger.debug(
+            "Started adaptive segment %d at %dms (noise=%.3f)",
+            self._segment_index,
+            self._segment_start_ms,
+            self.noise_floor,
+        )
+
+    def _track_noise(self, energy: float) -> None:
+        # Sliding-window minimum over the open segment (monotonic deque, so
+        # O(1) amortised per frame).  Speech dips towards the floor between
+        # words; only noise keeps the whole window above it.
+        window = max(1, self.noise_track_ms // max(1, self.frame_ms))
+        self._track_frames += 1
+        minima = self._track_minima
+        while minima and minima[-1][1] >= energy:
+            minima.pop()
+        minima.append((self._track_frames, energy))
+        if minima[0][0] <= self._track_frames - window:
+            minima.popleft()
+        if self._track_frames >= window and minima[0][1] > self.noise_floor:
+            logger.debug("Raising noise floor to %.3f after %d frames of sustained energy", minima[0][1], window)
+            self._noise_floor = minima[0][1]
+
+    def _clear_tracking(self) -> None:
+        self._track_frames = 0
+        self._track_minima.clear()
+
+    def _clear_pending(self) -> None:
+        self._pending_samples = []
+        self._pending_transcript = []
+        self._pending_chunks = []
+
+    @staticmethod
+    def _note_chunk(chunks: List[int], transcript: List[str], chunk_index: int, hint: str) -> None:
+        if chunks and chunks[-1] == chunk_index:
+            return
+        chunks.append(chunk_index)
+        if hint:
+            transcript.append(hint.strip())
+
     def _start_segment(self, start_ms: int, chunk_index: int, transcript_hint: str) -> None:
         self._active = True
-        self._segment_start_ms = start_ms
-        self._segment_samples = []
+        self._segment_start_ms = start_ms - len(self._preroll) * self.frame_ms
+        self._segment_samples = list(self._preroll)
+        self._segment_preroll = len(self._preroll)
         self._segment_transcript = [transcript_hint.strip()] if transcript_hint else []
         self._segment_chunks = [chunk_index]
         self._silence_ms = 0
+        self._preroll.clear()
         logger.debug("Started segment %d at %dms (chunk %d)", self._segment_index, start_ms, chunk_index)
+        self._emit_start()
 
-    def _close_segment(self, end_ms: int) -> SpeechSegment:
+    def _close_segment(self, end_ms: int, forced: bool = False) -> SpeechSegment:
+        self._emit_append()
         self._active = False
         transcript = " ".join(part for part in self._segment_transcript if part)
+        samples = tuple(self._segment_samples)
+        speech_frames = len(samples) - self._segment_preroll
         segment = SpeechSegment(
             start_ms=self._segment_start_ms,
             end_ms=end_ms,
-            samples=tuple(self._segment_samples),
+            samples=samples,
             transcript_hint=transcript.strip(),
             chunk_indices=list(self._segment_chunks),
+            # Gate on the onset frames only: silent pre-roll would drag the
+            # mean below the ASR's silence threshold.
+            stats=SignalStats.compute(samples[self._segment_preroll :], self.voiced_threshold()),
         )
         self._segment_samples = []
         self._segment_transcript = []
         self._segment_chunks = []
+        self._segment_preroll = 0
         self._segment_start_ms = end_ms
         self._silence_ms = 0
         self._segment_index += 1
+        self._record_metrics(segment, speech_frames, forced)
+        if self._listeners:
+            self._emit(SegmentEvent("end", self._segment_index - 1, segment.start_ms, segment=segment))
         logger.debug(
             "Closed segment %d at %dms (duration=%dms, hint=%d chars)",
             self._segment_index - 1,
@@ -127,5 +370,88 @@ class SileroVADSegmenter:
         )
         return segment
 
+    def _emit_start(self) -> None:
+        self._emitted = len(self._segment_samples)
+        if self._listeners:
+            self._emit(
+                SegmentEvent(
+                    "start",
+                    self._segment_index,
+                    self._segment_start_ms,
+                    tuple(self._segment_samples),
+                    " ".join(part for part in self._segment_transcript if part),
+                )
+            )
+
+    def _emit_append(self) -> None:
+        if not self._active or self._emitted >= len(self._segment_samples):
+            return
+        fresh = tuple(self._segment_samples[self._emitted :])
+        self._emitted = len(self._segment_samples)
+        if self._listeners:
+            self._emit(
+                SegmentEvent(
+                    "append",
+                    self._segment_index,
+                    self._segment_start_ms,
+                    fresh,
+                    " ".join(part for part in self._segment_transcript if part),
+                )
+            )
+
+    def _emit(self, event: SegmentEvent) -> None:
+        for listener in self._listeners:
+            listener(event)
+
     def _segment_duration_ms(self) -> int:
         return self._current_time_ms - self._segment_start_ms
+
+    def _record_metrics(self, segment: SpeechSegment, speech_frames: int, forced: bool) -> None:
+        # Pre-roll frames are context, not speech; only frames kept from the
+        # onset on count towards the short (false-trigger) check.
+        metrics = self.metrics
+        metrics.segments += 1
+        metrics.total_segment_ms += segment.duration_ms()
+        if speech_frames * self.frame_ms < self.min_speech_ms:
+            metrics.short_segments += 1
+        if forced:
+            metrics.forced_splits += 1
+
+
+def score_segments(
+    segments: Sequence[SpeechSegment],
+    speech_spans: Sequence[Tuple[int, int]],
+    min_silence_ms: int,
+    tolerance_ms: int = 40,
+) -> VADScore:
+    """Score *segments* against labelled ``(start_ms, end_ms)`` speech spans.
+
+    A segment overlapping no span is a false segment.  A span is tail-truncated
+    when the last voiced frame of the final segment covering it (its end minus
+    the silence timeout) falls more than *tolerance_ms* before the span ends.
+    """
+
+    false_segments = 0
+    last_end_by_span: dict[int, int] = {}
+    for segment in segments:
+        overlapping = [
+            index
+            for index, (start, end) in enumerate(speech_spans)
+            if segment.start_ms < end and segment.end_ms > start
+        ]
+        if not overlapping:
+            false_segments += 1
+        for index in overlapping:
+            last_end_by_span[index] = max(last_end_by_span.get(index, 0), segment.end_ms)
+
+    truncated = sum(
+        1
+        for index, end in last_end_by_span.items()
+        if end - min_silence_ms < speech_spans[index][1] - tolerance_ms
+    )
+    total_ms = sum(segment.duration_ms() for segment in segments)
+    return VADScore(
+        false_segments=false_segments,
+        mean_segment_ms=total_ms / len(segments) if segments else 0.0,
+        tail_truncation_rate=truncated / len(last_end_by_span) if last_end_by_span else 0.0,
+    )
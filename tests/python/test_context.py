@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import (
+    AudioChunk,
+    Config,
+    LLMContextManager,
+    LLMSpec,
+    PipelineDependencies,
+    SpeechToStructuredTextPipeline,
+    StructuredLLMFormatter,
+    estimate_tokens,
+)
+
+
+def test_estimate_tokens_counts_cjk_per_character():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("会议主题") == 4
+    assert estimate_tokens("release plan") == 3
+
+
+def test_prompt_size_stays_flat_over_an_hour_of_dictation():
+    spec = LLMSpec(max_tokens=800, context_tokens=2048, context_recent_tokens=400, context_summary_tokens=120)
+    context = LLMContextManager.from_spec(spec)
+    formatter = StructuredLLMFormatter(context=context, system_prompt=spec.prompt)
+
+    sizes = []
+    # One segment every two seconds for an hour.
+    for index in range(1800):
+        formatter.structure(f"主题{index // 30}的讨论。需要王强负责第{index}项跟进并在明天前完成。")
+        sizes.append(formatter.last_prompt.prompt_tokens)
+
+    budget = spec.context_tokens - spec.max_tokens
+    assert max(sizes) <= budget
+    assert max(sizes[-300:]) <= max(sizes[:300]) * 1.1
+    assert context.window_tokens <= spec.context_recent_tokens + spec.context_summary_tokens
+    assert context.metrics.prompts == 1800
+    assert context.metrics.summarised_segments > 0
+    assert "已整理摘要" in formatter.last_prompt.text
+
+
+def test_summary_merges_consecutive_segments_on_same_topic():
+    context = LLMContextManager(recent_tokens=10, summary_tokens=200)
+    formatter = StructuredLLMFormatter(context=context)
+
+    formatter.structure("会议主题发布计划。需要王强准备物料。")
+    formatter.structure("会议主题发布计划。安排李雷更新日程。")
+    formatter.structure("另一件事情。")
+
+    assert context.summary_text.count("会议主题发布计划") == 1
+    assert "王强" in context.summary_text and "李雷" in context.summary_text
+
+
+def test_oversized_transcript_is_truncated_to_budget():
+    context = LLMContextManager(context_tokens=120, max_tokens=100)
+    build = context.build_prompt("很长的口述内容" * 50)
+
+    assert build.truncated
+    assert build.prompt_tokens + build.max_tokens <= context.context_tokens
+
+
+def test_default_dependencies_wire_context_and_undo_clears_it():
+    config = Config.from_mapping({"llm": {"context_tokens": 2048, "context_recent_tokens": 300}})
+    pipeline = SpeechToStructuredTextPipeline(config, PipelineDependencies.from_config(config))
+    context = pipeline.deps.llm.context
+
+    assert context is not None
+    assert (context.context_tokens, context.recent_tokens) == (2048, 300)
+    pipeline.process_stream([AudioChunk(timestamp_ms=0, samples=[0.9] * 3, transcript_hint="撤销前的内容")])
+    assert context.window_tokens > 0
+
+    pipeline.undo_last_insert()
+    assert context.window_tokens == 0
+    assert "撤销前的内容" not in context.build_prompt("新的片段").text
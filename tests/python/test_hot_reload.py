@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import AudioChunk, Config, ConfigReloader, PriorityScheduler, diff_config
+
+from test_pipeline import build_pipeline
+
+
+def write_config(path: Path, payload: dict) -> None:
+    path.write_text(yaml.safe_dump(payload, allow_unicode=True), encoding="utf-8")
+    # Make sure the watcher sees a new signature even on coarse mtime clocks.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def running_payload(pipeline) -> dict:
+    config = pipeline.config
+    return {
+        "vad": {
+            "threshold": config.vad.threshold,
+            "min_silence_ms": config.vad.min_silence_ms,
+            "max_segment_ms": config.vad.max_segment_ms,
+            "frame_ms": config.vad.frame_ms,
+        },
+        "structuring": {
+            "default_template": config.structuring.default_template,
+            "realtime_write": config.structuring.realtime_write,
+            "merge_policy": config.structuring.merge_policy,
+        },
+        "app": {"language_ui": "zh-CN"},
+    }
+
+
+def test_diff_config_reports_changed_sections_only():
+    old = Config.from_mapping({"templates": {"generic": "a"}})
+    new = Config.from_mapping({"templates": {"generic": "b"}, "vad": {"threshold": 0.7}})
+
+    assert diff_config(old, old) == frozenset()
+    assert diff_config(old, new) == {"templates", "vad"}
+
+
+def test_template_change_rebuilds_only_renderer(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+    asr, llm, vad, renderer = pipeline.deps.asr, pipeline.deps.llm, pipeline.deps.vad, pipeline.deps.renderer
+
+    payload = running_payload(pipeline)
+    payload["templates"] = {"generic": "T:${topic}"}
+    write_config(path, payload)
+    assert reloader.check() is True
+
+    output = pipeline.process_stream(
+        [
+            AudioChunk(timestamp_ms=0, samples=[0.0, 0.0], transcript_hint=""),
+            AudioChunk(timestamp_ms=40, samples=[0.8, 0.7], transcript_hint="会议主题讨论测试"),
+            AudioChunk(timestamp_ms=80, samples=[0.0, 0.0, 0.0], transcript_hint=""),
+        ]
+    )
+
+    assert output == "T:会议主题讨论测试"
+    assert pipeline.deps.renderer is not renderer
+    assert (pipeline.deps.asr, pipeline.deps.llm, pipeline.deps.vad) == (asr, llm, vad)
+    assert reloader.check() is False
+
+
+def test_vad_retune_waits_for_segment_boundary_and_keeps_warm_state(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+    old_vad = pipeline.deps.vad
+    old_vad.mode = "adaptive"
+    old_vad._noise_floor = 0.3
+
+    old_vad.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.9] * 4, transcript_hint="会议主题"), 0)
+    payload = running_payload(pipeline)
+    payload["vad"]["threshold"] = 0.7
+    write_config(path, payload)
+    assert reloader.check() is True
+
+    pipeline.process_chunk(AudioChunk(timestamp_ms=80, samples=[0.9, 0.8], transcript_hint=""), 1)
+    assert pipeline.deps.vad.threshold == 0.5
+
+    pipeline.process_chunk(AudioChunk(timestamp_ms=120, samples=[0.0, 0.0, 0.0], transcript_hint=""), 2)
+    assert pipeline.deps.vad is old_vad
+    assert old_vad.threshold == 0.7
+    assert pipeline.config.vad.threshold == 0.7
+    assert old_vad.noise_floor > 0.0
+    assert len(old_vad.listeners) == 1
+
+
+def test_vad_geometry_change_rebuilds_and_carries_ring(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+    old_vad = pipeline.deps.vad
+    old_vad.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.1, 0.2, 0.3]), 0)
+    old_vad._noise_floor = 0.3
+
+    payload = running_payload(pipeline)
+    payload["vad"]["preroll_ms"] = 40
+    write_config(path, payload)
+    assert reloader.check() is True
+    pipeline.process_chunk(AudioChunk(timestamp_ms=60, samples=[0.4]), 1)
+
+    vad = pipeline.deps.vad
+    assert vad is not old_vad
+    assert list(vad._preroll) == [0.3, 0.4]
+    assert vad.noise_floor == 0.3
+    assert vad.metrics is old_vad.metrics
+    assert vad.listeners == (pipeline._on_segment_event,)
+
+
+def test_undo_cap_reload_reaches_every_strategy_journal(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+
+    payload = running_payload(pipeline)
+    payload["insertion"] = {"undo_max_chars": 1024}
+    write_config(path, payload)
+    assert reloader.check() is True
+    pipeline.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.0]), 0)
+
+    insertion = pipeline.deps.insertion
+    assert insertion.undo_max_chars == insertion.journal.max_chars == 1024
+    assert [strategy.journal.max_chars for strategy in insertion.strategies] == [1024] * 3
+
+
+def test_structuring_and_strategy_order_reload_retune_insertion_in_place(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+    insertion = pipeline.deps.insertion
+    uia = insertion.strategies[1]
+    uia.insert("已插入")
+
+    payload = running_payload(pipeline)
+    payload["structuring"]["realtime_write"] = False
+    payload["insertion"] = {"strategy_order": ["uia", "clipboard", "sendkeys"]}
+    write_config(path, payload)
+    assert reloader.check() is True
+    pipeline.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.0]), 0)
+
+    assert pipeline.deps.insertion is insertion
+    assert insertion.realtime_write is False
+    assert [strategy.name for strategy in insertion.strategies] == ["uia", "clipboard", "sendkeys"]
+    assert insertion.strategies[0] is uia and uia.journal.document == "已插入"
+
+
+def test_scheduled_reload_switches_vad_and_asr_at_one_boundary(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    pipeline.scheduler = PriorityScheduler()
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+    old_asr, renderer = pipeline.deps.asr, pipeline.deps.renderer
+    release = threading.Event()
+    try:
+        pipeline.scheduler.submit_final(release.wait)
+        pipeline.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.9, 0.8], transcript_hint="会议主题"), 0)
+        payload = running_payload(pipeline)
+        payload["vad"]["threshold"] = 0.7
+        payload["asr"] = {"language": "en-US"}
+        payload["templates"] = {"generic": "T:${topic}"}
+        write_config(path, payload)
+        assert reloader.check() is True
+
+        pipeline.process_chunk(AudioChunk(timestamp_ms=40, samples=[0.0, 0.0, 0.0]), 1)
+        # Both audio-side components switched while final work is still queued.
+        assert pipeline.deps.vad.threshold == 0.7
+        assert pipeline.deps.asr is not old_asr and pipeline.deps.asr.language == "en-US"
+        assert pipeline.deps.renderer is renderer
+        assert old_asr.open_stream_count == 0
+    finally:
+        release.set()
+        output = pipeline.finish()
+        pipeline.scheduler.close()
+
+    # The segment queued before the switch still renders with the old template.
+    assert pipeline.deps.renderer is not renderer
+    assert output.startswith("主题：会议主题")
+
+
+def test_invalid_config_keeps_running_setup(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    path = tmp_path / "config.yaml"
+    write_config(path, running_payload(pipeline))
+    reloader = ConfigReloader(path, pipeline)
+    config = pipeline.config
+
+    path.write_text("vad: [unclosed", encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 2_000_000))
+
+    assert reloader.check() is False
+    assert pipeline.config is config
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import AudioChunk, InsertionController, InsertionStrategy, UndoJournal
+
+from test_pipeline import build_pipeline
+
+
+def test_journal_records_compact_ops_and_supports_multi_step_undo():
+    journal = UndoJournal()
+    journal.record("主题：发布")
+    journal.record("主题：发布\n\n要点：彩排")
+    op = journal.record("主题：发布\n\n要点：物料")
+
+    assert op.offset == len("主题：发布\n\n要点：")
+    assert op.removed == "彩排"
+    assert op.inserted == "物料"
+
+    journal.undo()
+    assert journal.document == "主题：发布\n\n要点：彩排"
+    journal.undo()
+    assert journal.document == "主题：发布"
+    journal.undo()
+    assert journal.document == ""
+    assert journal.undo() is None
+
+
+def test_controller_undo_routes_each_step_to_its_strategy():
+    strategies = [InsertionStrategy(name="sendinput", max_length=5), InsertionStrategy(name="uia")]
+    controller = InsertionController(strategies=strategies, realtime_write=True)
+
+    controller.stage("短文本")
+    controller.stage("这是一段更长的文本")
+
+    assert [op.strategy for op in controller.journal] == ["sendinput", "uia"]
+    assert list(controller.committed_blocks) == ["短文本", "这是一段更长的文本"]
+
+    controller.undo_last()
+    assert len(strategies[1].inserted) == 0
+    assert strategies[0].inserted[-1] == "短文本"
+
+    controller.undo_last()
+    assert len(strategies[0].inserted) == 0
+    assert not controller.committed_blocks
+
+
+def test_journal_memory_stays_flat_over_long_session():
+    pipeline = build_pipeline(realtime=True)
+    insertion = pipeline.deps.insertion
+    # Roughly ten minutes of dictation at one segment every two seconds.
+    chunks = []
+    for index in range(300):
+        timestamp = index * 160
+        chunks.append(AudioChunk(timestamp_ms=timestamp, samples=[0.8, 0.7], transcript_hint=f"需要王强跟进事项{index}"))
+        chunks.append(AudioChunk(timestamp_ms=timestamp + 40, samples=[0.0, 0.0, 0.0], transcript_hint=""))
+
+    final_text = pipeline.process_stream(chunks)
+
+    full_copies = sum(len(block) for block in _growing_prefixes(final_text))
+    assert insertion.committed_blocks[-1] == final_text
+    assert insertion.journal.memory_chars <= insertion.undo_max_chars
+    assert insertion.journal.memory_chars < len(final_text) * 2 < full_copies
+    for strategy in insertion.strategies:
+        assert strategy.journal.memory_chars <= insertion.undo_max_chars
+
+
+def test_journal_cap_drops_oldest_but_keeps_last_op():
+    journal = UndoJournal(max_chars=10)
+    for index in range(20):
+        journal.record("x" * (index + 1) * 4)
+
+    assert journal.memory_chars <= 10 or len(journal) == 1
+    last = journal.peek()
+    journal.undo()
+    assert journal.document == "x" * 19 * 4
+    assert last is not None and len(last.inserted) == 4
+
+
+def _growing_prefixes(text: str):
+    parts = text.split("\n\n")
+    for end in range(1, len(parts) + 1):
+        yield "\n\n".join(parts[:end])
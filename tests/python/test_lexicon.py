@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import (
+    AudioChunk,
+    DoubaoASRClient,
+    Lexicon,
+    LexiconConfig,
+    LexiconEntry,
+    SpeechSegment,
+    StructuredLLMFormatter,
+)
+
+from test_pipeline import build_pipeline
+
+
+benchmark = pytest.mark.skipif(not os.environ.get("VTSW_BENCHMARKS"), reason="timing benchmark; set VTSW_BENCHMARKS=1")
+
+
+def test_finds_overlapping_terms_in_one_pass():
+    lexicon = Lexicon([LexiconEntry("he", "term"), LexiconEntry("she", "term"), LexiconEntry("hers", "term")])
+
+    found = {(match.start, match.term) for match in lexicon.find_all("ushers")}
+
+    assert found == {(1, "she"), (2, "he"), (2, "hers")}
+
+
+def test_known_owner_names_drive_action_owner():
+    lexicon = Lexicon.from_config(LexiconConfig(owners=("王强",)))
+    formatter = StructuredLLMFormatter(lexicon=lexicon)
+
+    segment = formatter.structure("需要王强准备物料 下周彩排")
+
+    assert segment.actions[0].owner == "王强"
+    assert segment.actions[0].description == "准备物料 下周彩排"
+    assert segment.actions[0].due == "下周"
+
+
+def test_owner_next_to_the_action_keyword_wins_over_the_first_name():
+    lexicon = Lexicon.from_config(LexiconConfig(owners=("王强", "李雷")))
+    formatter = StructuredLLMFormatter(lexicon=lexicon)
+
+    reported = formatter.structure("王强说李雷负责发布会").actions[0]
+    assigned = formatter.structure("王强汇报进度，安排李雷下周彩排").actions[0]
+
+    assert (reported.owner, reported.description) == ("李雷", "发布会")
+    assert (assigned.owner, assigned.description) == ("李雷", "下周彩排")
+
+
+def test_custom_action_keyword_drives_owner_fallback():
+    lexicon = Lexicon.from_config(LexiconConfig(action_keywords=("跟进",)))
+    formatter = StructuredLLMFormatter(lexicon=lexicon)
+
+    before = formatter.structure("会议主题。李四跟进接口联调").actions[0]
+    after = formatter.structure("会议主题。跟进赵六并确认排期").actions[0]
+
+    assert (before.owner, before.description) == ("李四", "跟进接口联调")
+    assert (after.owner, after.description) == ("赵六", "并确认排期")
+
+
+def test_hotwords_are_corrected_in_asr_output(tmp_path):
+    dictionary = tmp_path / "team.tsv"
+    dictionary.write_text("# kind\tterm\tvalue\nhotword\t豆包语音\tDoubao ASR\nowner\t韩梅梅\n", encoding="utf-8")
+    lexicon = Lexicon.from_config(LexiconConfig(files=(str(dictionary),)))
+    asr = DoubaoASRClient(lexicon=lexicon)
+
+    result = asr.transcribe_segment(SpeechSegment(0, 100, (0.8,), transcript_hint="接入豆包语音并联系韩梅梅"))
+
+    assert result.text == "接入Doubao ASR并联系韩梅梅"
+
+
+def test_voice_commands_are_routed_through_pipeline():
+    pipeline = build_pipeline(realtime=True)
+    pipeline.deps.lexicon = Lexicon.from_config(LexiconConfig())
+    routed = []
+    pipeline.command_handlers["new_paragraph"] = routed.append
+
+    pipeline.process_stream(
+        [
+            AudioChunk(timestamp_ms=0, samples=[0.8, 0.7], transcript_hint="新段落 会议主题讨论测试"),
+            AudioChunk(timestamp_ms=40, samples=[0.0, 0.0, 0.0], transcript_hint=""),
+        ]
+    )
+
+    assert [match.term for match in routed] == ["新段落"]
+
+
+def test_reload_only_recompiles_on_change():
+    config = LexiconConfig(owners=("王强",))
+    lexicon = Lexicon.from_config(config)
+
+    assert lexicon.reload(config) is False
+    assert lexicon.reload(LexiconConfig(owners=("王强", "李雷"))) is True
+    assert [match.term for match in lexicon.find_all("李雷负责", ("owner",))] == ["李雷"]
+
+
+TERMS = [f"术语{index:05d}" for index in range(10_000)]
+TERM_TEXT = "".join(f"今天讨论了术语{index:05d}的进展，" for index in range(0, 10_000, 97))
+
+
+def test_10k_terms_match_naive_counts():
+    lexicon = Lexicon(LexiconEntry(term, "term") for term in TERMS)
+
+    assert len(lexicon.find_all(TERM_TEXT)) == sum(TERM_TEXT.count(term) for term in TERMS) == len(range(0, 10_000, 97))
+
+
+@benchmark
+def test_benchmark_10k_terms_beats_naive_scan():
+    lexicon = Lexicon(LexiconEntry(term, "term") for term in TERMS)
+
+    started = time.perf_counter()
+    automaton_hits = len(lexicon.find_all(TERM_TEXT))
+    automaton_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    naive_hits = sum(TERM_TEXT.count(term) for term in TERMS)
+    naive_s = time.perf_counter() - started
+
+    assert automaton_hits == naive_hits
+    assert automaton_s < naive_s
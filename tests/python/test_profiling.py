@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import (
+    AudioChunk,
+    Config,
+    PipelineDependencies,
+    PipelineProfiler,
+    ProfilingConfig,
+    SpeechToStructuredTextPipeline,
+)
+
+from test_pipeline import build_pipeline
+
+
+CHUNKS = [
+    AudioChunk(timestamp_ms=0, samples=[0.1, 0.6, 0.7, 0.2], transcript_hint="会议主题确定产品发布"),
+    AudioChunk(timestamp_ms=80, samples=[0.0, 0.0, 0.0, 0.0], transcript_hint=""),
+    AudioChunk(timestamp_ms=160, samples=[0.6, 0.72, 0.7, 0.1], transcript_hint="安排下周彩排并更新日程"),
+    AudioChunk(timestamp_ms=240, samples=[0.0, 0.0, 0.0, 0.0], transcript_hint=""),
+]
+
+
+def test_profiler_disabled_by_default_records_nothing():
+    pipeline = build_pipeline(realtime=True)
+    pipeline.process_stream(CHUNKS)
+
+    assert not pipeline.profiler.enabled
+    assert pipeline.profiler.report()["stages"] == {}
+
+
+def test_profiler_reports_every_stage_and_writes_files(tmp_path):
+    pipeline = build_pipeline(realtime=True)
+    profiler = PipelineProfiler(ProfilingConfig(sample_interval_ms=1, snapshot_every=1, output_dir=str(tmp_path)))
+    pipeline.profiler = profiler
+
+    assert profiler.toggle() is True
+    pipeline.process_stream(CHUNKS)
+    profiler.toggle()
+
+    stages = profiler.report()["stages"]
+    assert set(stages) == {"process_chunk", "transcribe_segment", "structure", "render", "commit"}
+    assert stages["process_chunk"]["calls"] == len(CHUNKS)
+    assert stages["structure"]["snapshots"] == stages["structure"]["calls"]
+
+    paths = profiler.write_reports()
+    assert {path.suffix for path in paths} == {".json", ".log"}
+    payload = json.loads(paths[0].read_text(encoding="utf-8"))
+    assert "commit" in payload["stages"]
+
+
+def test_close_stops_the_profiler_the_pipeline_started():
+    config = Config.from_mapping({"profiling": {"enabled": True, "sample_interval_ms": 1, "tracemalloc": False}})
+    pipelines = [SpeechToStructuredTextPipeline(config, PipelineDependencies.from_config(config)) for _ in range(3)]
+    for pipeline in pipelines:
+        pipeline.process_stream(CHUNKS)
+        pipeline.close()
+
+    assert not any(pipeline.profiler.enabled for pipeline in pipelines)
+    assert not [thread for thread in threading.enumerate() if thread.name == "vtsw-profiler"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import (
+    AudioChunk,
+    PipelineProfiler,
+    ProfilingConfig,
+    RecordedSession,
+    SessionRecorder,
+    SessionReplayer,
+    StructuredLLMFormatter,
+)
+
+from test_pipeline import build_pipeline
+
+
+CHUNKS = [
+    AudioChunk(timestamp_ms=0, samples=[0.1, 0.6, 0.7, 0.2], transcript_hint="会议主题确定产品发布"),
+    AudioChunk(timestamp_ms=80, samples=[0.6, 0.7, 0.65, 0.3], transcript_hint="需要王强准备物料 下周彩排"),
+    AudioChunk(timestamp_ms=160, samples=[0.0, 0.0, 0.0, 0.0], transcript_hint=""),
+    AudioChunk(timestamp_ms=240, samples=[0.6, 0.72, 0.7, 0.1], transcript_hint="安排下周彩排并更新日程"),
+    AudioChunk(timestamp_ms=320, samples=[0.0, 0.0, 0.0, 0.0], transcript_hint=""),
+]
+
+
+def record_session(path: Path) -> str:
+    pipeline = build_pipeline(realtime=True)
+    recorder = SessionRecorder.open(path)
+    pipeline.recorder = recorder
+    output = pipeline.process_stream(CHUNKS)
+    recorder.close()
+    return output
+
+
+def test_recorded_session_round_trips_every_stage(tmp_path):
+    path = tmp_path / "session.vtswrec"
+    output = record_session(path)
+
+    session = RecordedSession.load(path)
+    assert [chunk.transcript_hint for chunk in session.chunks] == [chunk.transcript_hint for chunk in CHUNKS]
+    assert session.chunks[1].samples == pytest.approx(CHUNKS[1].samples)
+    assert len(session.segments) == len(session.transcripts) == len(session.structured) == len(session.rendered)
+    assert session.inserts[-1][0] == output
+    assert session.inserts[-1][2] is not None and session.inserts[-1][2].strategy == "uia"
+
+
+def test_replay_matches_original_with_and_without_substitution(tmp_path):
+    path = tmp_path / "session.vtswrec"
+    output = record_session(path)
+    replayer = SessionReplayer.from_file(path)
+
+    assert replayer.replay(build_pipeline(realtime=True)) == output
+    assert replayer.replay(build_pipeline(realtime=True), substitute=("vad", "asr", "llm")) == output
+
+
+def test_replay_leaves_caller_components_untouched(tmp_path):
+    path = tmp_path / "session.vtswrec"
+    output = record_session(path)
+    pipeline = build_pipeline(realtime=True)
+    events = []
+    pipeline.deps.vad.add_listener(events.append)
+
+    replayer = SessionReplayer.from_file(path)
+    assert replayer.replay(pipeline) == output
+    assert replayer.replay(pipeline) == output
+
+    assert not events
+    assert len(pipeline.deps.vad.listeners) == 2
+    assert pipeline.deps.merger.segment_count == 0
+    assert pipeline.deps.insertion.journal.document == ""
+    pipeline.deps.vad.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.8, 0.7]), 0)
+    assert pipeline.deps.asr.streamed_frames(0) == 2
+
+
+def test_replay_shares_the_caller_profiler_without_starting_threads(tmp_path):
+    path = tmp_path / "session.vtswrec"
+    output = record_session(path)
+    pipeline = build_pipeline(realtime=True)
+    pipeline.profiler = PipelineProfiler(ProfilingConfig(enabled=True, sample_interval_ms=1, tracemalloc=False))
+    try:
+        assert SessionReplayer.from_file(path).replay(pipeline) == output
+        assert pipeline.profiler.report()["stages"]
+        assert len([thread for thread in threading.enumerate() if thread.name == "vtsw-profiler"]) == 1
+    finally:
+        pipeline.profiler.stop()
+
+
+def test_truncated_log_tail_is_ignored(tmp_path):
+    path = tmp_path / "session.vtswrec"
+    record_session(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+
+    session = RecordedSession.load(path)
+    assert len(session.chunks) == len(CHUNKS)
+    assert len(session.inserts) < len(session.rendered)
+
+
+def test_benchmark_single_stage_with_recorded_inputs(tmp_path):
+    path = tmp_path / "session.vtswrec"
+    record_session(path)
+    replayer = SessionReplayer.from_file(path)
+    formatter = StructuredLLMFormatter()
+
+    result = replayer.benchmark_stage("llm", formatter.structure, repeat=3)
+    assert result.calls == len(replayer.session.transcripts) * 3
+    assert result.per_call_ms >= 0.0
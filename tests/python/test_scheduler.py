@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import AudioChunk, Config, PipelineDependencies, PriorityScheduler, SpeechToStructuredTextPipeline
+
+from test_pipeline import build_pipeline
+
+
+SUBTITLE_BUDGET_MS = 400  # TestPlan P-001
+
+
+def test_subtitle_latency_stays_within_budget_under_structuring_backlog():
+    scheduler = PriorityScheduler(workers=2, live_reserved_workers=1)
+    delivered = []
+    try:
+        for _ in range(20):
+            scheduler.submit_final(lambda: time.sleep(0.05))
+        for index in range(20):
+            submitted = time.perf_counter()
+            scheduler.submit_live(
+                "subtitle", lambda submitted=submitted: delivered.append((time.perf_counter() - submitted) * 1000)
+            )
+            time.sleep(0.02)
+        scheduler.drain(timeout=5)
+    finally:
+        scheduler.close()
+
+    stats = scheduler.stats()
+    assert delivered and max(delivered) < SUBTITLE_BUDGET_MS
+    assert stats["live"].max_wait_ms < SUBTITLE_BUDGET_MS
+    assert stats["final"].max_queue_depth >= 15
+    assert stats["final"].completed == 20
+    assert stats["live"].completed + stats["live"].superseded == 20
+
+
+def test_newer_live_update_supersedes_queued_one_and_final_work_is_ordered():
+    scheduler = PriorityScheduler(workers=2, live_reserved_workers=1)
+    gate = threading.Event()
+    seen = []
+    order = []
+    try:
+        # Occupy the reserved worker so live updates queue up behind it.
+        scheduler.submit_live("block", gate.wait)
+        time.sleep(0.02)
+        for index in range(3):
+            scheduler.submit_final(lambda index=index: order.append(index))
+        scheduler.submit_live("subtitle", lambda: seen.append("old"))
+        scheduler.submit_live("subtitle", lambda: seen.append("new"))
+        gate.set()
+        scheduler.drain(timeout=5)
+    finally:
+        scheduler.close()
+
+    assert seen == ["new"]
+    assert order == [0, 1, 2]
+    assert scheduler.stats()["live"].superseded == 1
+
+
+def test_task_errors_surface_on_drain():
+    scheduler = PriorityScheduler()
+    try:
+        scheduler.submit_final(lambda: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            scheduler.drain(timeout=5)
+    finally:
+        scheduler.close()
+
+
+def test_pipeline_output_matches_synchronous_run_when_scheduled():
+    chunks = [
+        AudioChunk(timestamp_ms=0, samples=[0.1, 0.6, 0.7, 0.2], transcript_hint="会议主题确定产品发布"),
+        AudioChunk(timestamp_ms=80, samples=[0.0, 0.0, 0.0, 0.0], transcript_hint=""),
+        AudioChunk(timestamp_ms=160, samples=[0.6, 0.72, 0.7, 0.1], transcript_hint="安排下周彩排并更新日程"),
+        AudioChunk(timestamp_ms=240, samples=[0.0, 0.0, 0.0, 0.0], transcript_hint=""),
+    ]
+    expected = build_pipeline(realtime=True).process_stream(chunks)
+
+    pipeline = build_pipeline(realtime=True)
+    pipeline.scheduler = PriorityScheduler()
+    subtitles = []
+    pipeline.subtitle_handlers.append(subtitles.append)
+    try:
+        assert pipeline.process_stream(chunks) == expected
+    finally:
+        pipeline.scheduler.close()
+    assert subtitles and not subtitles[-1].is_final
+
+
+def test_close_shuts_down_a_scheduler_built_from_config():
+    config = Config.from_mapping({"scheduler": {"enabled": True}})
+    pipeline = SpeechToStructuredTextPipeline(config, PipelineDependencies.from_config(config))
+    assert isinstance(pipeline.scheduler, PriorityScheduler)
+    pipeline.close()
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("vtsw-worker-")]
+
+    injected = PriorityScheduler()
+    try:
+        pipeline = SpeechToStructuredTextPipeline(config, replace(PipelineDependencies.from_config(config), scheduler=injected))
+        pipeline.close()
+        injected.submit_final(lambda: None)
+        injected.drain(timeout=1)
+    finally:
+        injected.close()
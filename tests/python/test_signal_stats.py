@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import AudioChunk, DoubaoASRClient, FrameStats, SignalStats, SileroVADSegmenter, SpeechSegment
+
+
+benchmark = pytest.mark.skipif(not os.environ.get("VTSW_BENCHMARKS"), reason="timing benchmark; set VTSW_BENCHMARKS=1")
+
+
+def naive_stats(samples, threshold):
+    count = len(samples)
+    return (
+        math.sqrt(sum(value * value for value in samples) / count),
+        max(abs(value) for value in samples),
+        sum(abs(value) for value in samples) / count,
+        sum(1 for value in samples if abs(value) >= threshold) / count,
+    )
+
+
+SIGNAL = [((index * 37) % 101) / 100.0 * (-1 if index % 3 else 1) for index in range(30_000)]
+
+
+def test_compute_matches_naive_scan():
+    stats = SignalStats.compute(SIGNAL, 0.4)
+
+    rms, peak, mean, voiced = naive_stats(SIGNAL, 0.4)
+    assert stats.frame_count == len(SIGNAL)
+    assert stats.rms == pytest.approx(rms)
+    assert stats.peak == pytest.approx(peak)
+    assert stats.mean_amplitude == pytest.approx(mean)
+    assert stats.voiced_ratio == pytest.approx(voiced)
+    assert SignalStats.compute((), 0.4) == SignalStats(voiced_threshold=0.4)
+    assert SignalStats.compute([1, 0], 1).voiced_frames == 1
+
+
+def test_frame_windows_match_direct_compute():
+    frames = FrameStats(SIGNAL, 0.4)
+
+    for start, stop in ((0, 1), (100, 350), (29_000, 40_000), (-50, None)):
+        window = frames.window(start, stop)
+        expected = SignalStats.compute(SIGNAL[start:stop], 0.4)
+        assert window.frame_count == expected.frame_count
+        assert window.rms == pytest.approx(expected.rms)
+        assert window.peak == pytest.approx(expected.peak)
+        assert window.mean_amplitude == pytest.approx(expected.mean_amplitude)
+        assert window.voiced_ratio == pytest.approx(expected.voiced_ratio)
+    assert frames.window(10, 10).frame_count == 0
+    assert [window.frame_count for window in FrameStats([0.5] * 10).frames(4)] == [4, 4]
+    assert FrameStats([]).frames(4) == []
+
+
+def test_vad_attaches_stats_and_asr_reads_them():
+    vad = SileroVADSegmenter(threshold=0.5, min_silence_ms=40, max_segment_ms=4000, frame_ms=20)
+    assert vad.process_chunk(AudioChunk(0, [0.1, 0.1]), 0) == []
+    segments = vad.process_chunk(AudioChunk(40, [0.9, 0.6, 0.3, 0.7, 0.1, 0.1]), 1)
+
+    assert len(segments) == 1
+    stats = segments[0].stats
+    assert stats is not None and stats.voiced_threshold == 0.5
+    # The two pre-roll frames stay in the samples but not in the stats.
+    assert len(segments[0].samples) == 5
+    assert stats.frame_count == 3
+    assert stats.peak == 0.9
+    assert stats.voiced_ratio == 1.0
+    assert stats.mean_amplitude == pytest.approx(0.7333, abs=1e-4)
+
+    asr = DoubaoASRClient()
+    assert asr.transcribe_segment(segments[0]).text == "(未识别片段，平均幅度 0.73)"
+    assert asr.transcribe_segment(segments[0]).confidence == 0.85
+    quiet = SpeechSegment(0, 100, (0.1, 0.05))
+    result = asr.transcribe_segment(quiet)
+    assert (result.text, result.confidence) == ("(静音)", 0.0)
+    assert quiet.stats is not None
+
+
+def test_default_preroll_does_not_gate_short_speech_as_silence():
+    vad = SileroVADSegmenter(threshold=0.5, min_silence_ms=40, max_segment_ms=4000, frame_ms=20)
+    assert vad.process_chunk(AudioChunk(0, [0.0] * 20), 0) == []
+    segments = vad.process_chunk(AudioChunk(400, [0.8, 0.8, 0.0, 0.0, 0.0], "王强负责发布"), 1)
+
+    assert len(segments) == 1
+    assert len(segments[0].samples) > 2
+    assert segments[0].stats.mean_amplitude == pytest.approx(0.8)
+    asr = DoubaoASRClient()
+    assert asr.transcribe_segment(segments[0]).confidence == 0.85
+    segments[0].transcript_hint = ""
+    assert asr.transcribe_segment(segments[0]).text == "(未识别片段，平均幅度 0.80)"
+
+
+@benchmark
+def test_benchmark_window_queries_beat_rescanning():
+    windows = [(start, start + 400) for start in range(0, len(SIGNAL) - 400, 20)]
+
+    started = time.perf_counter()
+    frames = FrameStats(SIGNAL, 0.4)
+    indexed = [frames.window(start, stop).mean_amplitude for start, stop in windows]
+    indexed_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rescanned = [naive_stats(SIGNAL[start:stop], 0.4)[2] for start, stop in windows]
+    rescan_s = time.perf_counter() - started
+
+    assert indexed == pytest.approx(rescanned)
+    assert indexed_s < rescan_s
+
+
+@benchmark
+def test_benchmark_single_pass_beats_per_consumer_scans():
+    segment = SpeechSegment(0, 600_000, tuple(SIGNAL))
+    consumers = 3  # fallback transcript, confidence, quality check
+
+    started = time.perf_counter()
+    stats = SignalStats.compute(segment.samples, 0.4)
+    shared = [(stats.rms, stats.voiced_ratio) for _ in range(consumers)]
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rescanned = [naive_stats(segment.samples, 0.4) for _ in range(consumers)]
+    rescan_s = time.perf_counter() - started
+
+    assert shared[0] == pytest.approx((rescanned[0][0], rescanned[0][3]))
+    assert single_s < rescan_s
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant.soak import SoakHarness, SoakSettings, fit_slope, main
+
+from test_pipeline import build_pipeline
+
+
+def test_ten_minute_soak_meets_p003_targets(tmp_path: Path) -> None:
+    pipeline = build_pipeline(realtime=True)
+    settings = SoakSettings(duration_s=600, speed=0, output_dir=str(tmp_path))
+
+    result = SoakHarness(pipeline, settings).run()
+
+    assert result.passed, result.failures
+    assert result.cpu_share < settings.max_cpu_share
+    assert len(result.samples) == 61
+    final = result.samples[-1]
+    assert final.gauges["merger_segments"] == 200
+    assert final.gauges["undo_chars"] <= pipeline.deps.insertion.journal.max_chars
+    assert final.gauges["asr_open_streams"] == 0
+    # Undo history may grow up to its character cap; per-segment objects must not pile up.
+    transient = ("AudioChunk", "SpeechSegment", "SegmentEvent", "TranscriptResult", "StructuredSegment")
+    assert all(result.object_slopes_per_min[name] <= 0.5 for name in transient)
+
+    csv_path, json_path = result.write_report()
+    assert csv_path.read_text(encoding="utf-8").count("\n") == len(result.samples) + 1
+    assert json.loads(json_path.read_text(encoding="utf-8"))["passed"] is True
+
+
+def test_soak_reports_threshold_breaches() -> None:
+    settings = SoakSettings(
+        duration_s=60,
+        speed=0,
+        sample_interval_s=5,
+        max_cpu_share=0.0,
+        max_blocks_slope_per_min=-1e9,
+    )
+
+    result = SoakHarness(build_pipeline(), settings).run()
+
+    assert not result.passed
+    assert any(failure.startswith("CPU share") for failure in result.failures)
+    assert any(failure.startswith("Allocated blocks") for failure in result.failures)
+
+
+def test_fit_slope() -> None:
+    assert fit_slope([0, 1, 2, 3], [1, 3, 5, 7]) == 2
+    assert fit_slope([1], [5]) == 0.0
+    assert fit_slope([2, 2], [1, 9]) == 0.0
+
+
+def test_cli_runs_short_unpaced_soak(tmp_path: Path, capsys) -> None:
+    exit_code = main(["--duration", "30", "--speed", "0", "--interval", "5", "--output-dir", str(tmp_path)])
+
+    summary = json.loads(capsys.readouterr().out)
+    assert exit_code == 0
+    assert summary["passed"] is True
+    assert summary["audio_s"] == 30
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".csv", ".json"]
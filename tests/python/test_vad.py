@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src/python"))
+
+from vtswassistant import AudioChunk, SileroVADSegmenter, score_segments
+
+from test_pipeline import build_pipeline
+
+
+FRAME_MS = 20
+MIN_SILENCE_MS = 200
+
+
+def noisy_fixture(
+    noise: float, seed: int = 7, step: float | None = None
+) -> Tuple[List[AudioChunk], List[Tuple[int, int]]]:
+    """Speech bursts with decaying tails over a jittery floor with isolated spikes.
+
+    With *step*, the floor then jumps to a sustained noise level (fan, air
+    conditioner) above the static threshold for 20 s.
+    """
+
+    rng = random.Random(seed)
+    frames: List[float] = []
+    spans: List[Tuple[int, int]] = []
+    for _ in range(8):
+        frames.extend(noise + rng.uniform(-0.04, 0.04) for _ in range(40))
+        frames[-15] = 0.75  # isolated noise spike (door, keyboard)
+        start = len(frames) * FRAME_MS
+        frames.extend(0.85 + rng.uniform(-0.05, 0.05) for _ in range(60))
+        frames.extend(0.56 for _ in range(6))  # soft word ending below the static threshold
+        spans.append((start, len(frames) * FRAME_MS))
+    frames.extend(noise for _ in range(40))
+    if step is not None:
+        frames.extend(step + rng.uniform(-0.04, 0.04) for _ in range(1000))
+
+    chunks = [
+        AudioChunk(timestamp_ms=offset * FRAME_MS, samples=frames[offset : offset + 10])
+        for offset in range(0, len(frames), 10)
+    ]
+    return chunks, spans
+
+
+def run(vad: SileroVADSegmenter, chunks: List[AudioChunk]):
+    segments = []
+    for index, chunk in enumerate(chunks):
+        segments.extend(vad.process_chunk(chunk, index))
+    segments.extend(vad.flush())
+    return segments
+
+
+def build(mode: str) -> SileroVADSegmenter:
+    return SileroVADSegmenter(
+        threshold=0.58, min_silence_ms=MIN_SILENCE_MS, max_segment_ms=5000, frame_ms=FRAME_MS, mode=mode
+    )
+
+
+def test_adaptive_mode_cuts_false_segments_and_tail_truncation():
+    for noise in (0.1, 0.45):
+        chunks, spans = noisy_fixture(noise)
+        static = score_segments(run(build("static"), chunks), spans, MIN_SILENCE_MS)
+        adaptive_vad = build("adaptive")
+        adaptive = score_segments(run(adaptive_vad, chunks), spans, MIN_SILENCE_MS)
+
+        assert static.false_segments == len(spans)
+        assert adaptive.false_segments == 0
+        assert static.tail_truncation_rate == 1.0
+        assert adaptive.tail_truncation_rate == 0.0
+        assert adaptive_vad.metrics.segments == len(spans)
+        assert adaptive_vad.metrics.mean_segment_ms >= adaptive.mean_segment_ms - 1
+
+    chunks, spans = noisy_fixture(0.1, step=0.66)
+    static_vad = build("static")
+    static = score_segments(run(static_vad, chunks), spans, MIN_SILENCE_MS)
+    adaptive_vad = build("adaptive")
+    adaptive = score_segments(run(adaptive_vad, chunks), spans, MIN_SILENCE_MS)
+
+    # Static mode keeps force-splitting the noise; adaptive closes once on it.
+    assert static_vad.metrics.forced_splits >= 3
+    assert static.false_segments >= len(spans) + 4
+    assert adaptive.false_segments == 1
+    assert adaptive_vad.metrics.forced_splits == 0
+    assert adaptive.tail_truncation_rate == 0.0
+    assert adaptive_vad.thresholds()[0] > 0.7
+
+
+def test_adaptive_thresholds_track_noise_floor_with_hysteresis():
+    vad = build("adaptive")
+    run(vad, [AudioChunk(timestamp_ms=0, samples=[0.5] * 50)])
+
+    entry, exit_ = vad.thresholds()
+    assert abs(vad.noise_floor - 0.5) < 1e-6
+    assert abs(entry - 0.65) < 1e-6
+    assert vad.noise_floor < exit_ < entry
+
+
+def test_static_metrics_count_short_segments():
+    vad = build("static")
+    run(vad, [AudioChunk(timestamp_ms=0, samples=[0.0, 0.9, 0.0] + [0.0] * 20)])
+
+    assert vad.metrics.segments == 1
+    assert vad.metrics.short_segments == 1
+
+
+def test_short_segment_metric_ignores_default_preroll():
+    vad = SileroVADSegmenter(threshold=0.5, min_silence_ms=60, max_segment_ms=5000, frame_ms=20)
+    segments = run(vad, [AudioChunk(timestamp_ms=0, samples=[0.0] * 12 + [0.9] + [0.0] * 5)])
+
+    assert len(segments) == 1
+    assert len(segments[0].samples) == 11  # 10 pre-roll frames + the spike
+    assert vad.metrics.short_segments == 1
+
+
+def test_preroll_restores_onset_and_events_stream_open_segment():
+    vad = SileroVADSegmenter(threshold=0.5, min_silence_ms=60, max_segment_ms=5000, frame_ms=20, preroll_ms=60)
+    events = []
+    vad.add_listener(events.append)
+    chunks = [
+        AudioChunk(timestamp_ms=0, samples=[0.0, 0.1, 0.2, 0.3]),
+        AudioChunk(timestamp_ms=80, samples=[0.9, 0.8], transcript_hint="开始"),
+        AudioChunk(timestamp_ms=120, samples=[0.7, 0.0, 0.0, 0.0]),
+    ]
+
+    segments = run(vad, chunks)
+
+    assert len(segments) == 1
+    assert segments[0].start_ms == 80 - 60
+    assert list(segments[0].samples[:3]) == [0.1, 0.2, 0.3]
+    assert [event.kind for event in events] == ["start", "append", "append", "end"]
+    assert events[0].transcript_hint == "开始"
+    streamed = [sample for event in events[:-1] for sample in event.samples]
+    assert streamed == list(segments[0].samples)
+    assert events[-1].segment is segments[0]
+
+
+def test_static_onset_mid_chunk_keeps_lead_in_frames_as_preroll():
+    vad = SileroVADSegmenter(threshold=0.5, min_silence_ms=60, max_segment_ms=5000, frame_ms=20, preroll_ms=60)
+    chunks = [
+        AudioChunk(timestamp_ms=0, samples=[0.0, 0.0, 0.0, 0.0]),
+        AudioChunk(timestamp_ms=80, samples=[0.1, 0.2, 0.3, 0.9, 0.9]),
+    ]
+
+    segments = run(vad, chunks)
+
+    assert len(segments) == 1
+    assert segments[0].start_ms == 140 - 60
+    assert list(segments[0].samples) == [0.1, 0.2, 0.3, 0.9, 0.9]
+    assert segments[0].chunk_indices == [1]
+
+
+def test_pipeline_publishes_live_transcript_before_segment_closes():
+    pipeline = build_pipeline(realtime=True)
+    pipeline.deps.vad.process_chunk(AudioChunk(timestamp_ms=0, samples=[0.8, 0.7], transcript_hint="会议主题"), 0)
+
+    assert pipeline.live_transcript is not None
+    assert pipeline.live_transcript.text == "会议主题"
+    assert not pipeline.live_transcript.is_final
+    assert pipeline.deps.asr.streamed_frames(0) == 2